@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from module_workspace import ModuleWorkspace
+from model_spec import ModelSpec
+from odoo_model import OdooModelCreator
+from odoo_report import OdooReportGenerator
+from xml_generator import OdooXMLGenerator
+from odoo_ai import run_generators
+
+# (name, number of models, fields per model)
+SCENARIOS = [
+    ('fields_10', 1, 10),
+    ('fields_1k', 1, 1000),
+    ('fields_10k', 1, 10000),
+    ('models_1', 1, 20),
+    ('models_100', 100, 20),
+    ('models_1000', 1000, 20),
+]
+QUICK_SCENARIOS = ('fields_10', 'fields_1k', 'models_1', 'models_100')
+
+# Stages faster than this are too noisy to flag as timing regressions
+MIN_SECONDS = 0.005
+
+# One definition per supported field type, cycled to build schemas of any width
+FIELD_TEMPLATES = [
+    {'type': 'Char', 'string': 'Char', 'index': True},
+    {'type': 'Text', 'string': 'Text'},
+    {'type': 'Html', 'string': 'Html'},
+    {'type': 'Integer', 'string': 'Integer', 'default': 1},
+    {'type': 'Float', 'string': 'Float', 'index': 'btree'},
+    {'type': 'Monetary', 'string': 'Monetary'},
+    {'type': 'Boolean', 'string': 'Boolean'},
+    {'type': 'Date', 'string': 'Date'},
+    {'type': 'Datetime', 'string': 'Datetime'},
+    {'type': 'Binary', 'string': 'Binary'},
+    {'type': 'Image', 'string': 'Image', 'max_width': 1024, 'max_height': 1024, 'variants': True},
+    {'type': 'Selection', 'string': 'Selection', 'options': ['draft', 'confirmed', 'done']},
+    {'type': 'Many2one', 'string': 'Many2one', 'options': ['res.partner'], 'index': True},
+    {'type': 'One2many', 'string': 'One2many', 'options': ['res.partner'], 'inverse_name': 'parent_id'},
+    {'type': 'Many2many', 'string': 'Many2many', 'options': ['res.partner.category']},
+]
+
+def synthetic_definitions(model_count, field_count):
+    definitions = []
+    for model_index in range(model_count):
+        fields = [dict(FIELD_TEMPLATES[index % len(FIELD_TEMPLATES)], name=f"field_{index}")
+                  for index in range(field_count)]
+        definitions.append({
+            'model_name': f"bench.model{model_index}",
+            'fields': fields,
+            'access_rights': [{'name': 'user', 'read': 1, 'write': 1, 'create': 1, 'unlink': 1}],
+            'report': True,
+        })
+    return definitions
+
+def create_module(directory):
+    os.makedirs(os.path.join(directory, 'models'))
+    with open(os.path.join(directory, '__manifest__.py'), 'w') as manifest_file:
+        manifest_file.write('{"name": "Benchmark", "data": []}\n')
+    open(os.path.join(directory, 'models', '__init__.py'), 'w').close()
+
+def module_size(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+
+def parse_definitions(definitions):
+    for data in definitions:
+        ModelSpec.from_dict(data)
+    return 0
+
+def emit_models(specs):
+    return sum(len(OdooModelCreator(spec.model_name, spec.fields, '').generate_model_code()) for spec in specs)
+
+def emit_views(specs):
+    return sum(len(OdooXMLGenerator(spec.model_name, spec.fields, '', indexes=spec.indexes).generate_xml_content())
+               for spec in specs)
+
+def emit_reports(specs):
+    return sum(len(OdooReportGenerator(spec.model_name, spec.module_name, '', fields=spec.fields).generate_report_content())
+               for spec in specs)
+
+def write_module(specs):
+    with tempfile.TemporaryDirectory() as directory:
+        create_module(directory)
+        initial_size = module_size(directory)
+        workspace = ModuleWorkspace(directory)
+        for spec in specs:
+            run_generators(spec, workspace)
+        workspace.flush()
+        return module_size(directory) - initial_size
+
+def measure(function, argument, repeat):
+    """Return (best wall time, peak traced memory, bytes produced) for one stage."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        produced = function(argument)
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced in a separate pass so tracemalloc overhead does not skew the timings
+    tracemalloc.start()
+    function(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': min(timings), 'peak_bytes': peak, 'bytes': produced}
+
+def run_scenario(model_count, field_count, repeat):
+    definitions = synthetic_definitions(model_count, field_count)
+    specs = [ModelSpec.from_dict(data) for data in definitions]
+    stages = {
+        'parse': (parse_definitions, definitions),
+        'emit_models': (emit_models, specs),
+        'emit_views': (emit_views, specs),
+        'emit_reports': (emit_reports, specs),
+        'write_module': (write_module, specs),
+    }
+    # Generators print a line per file; keep benchmark output readable
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            return {stage: measure(function, argument, repeat) for stage, (function, argument) in stages.items()}
+        finally:
+            sys.stdout = stdout
+
+def compare(results, baseline, threshold):
+    """Return a message per stage whose wall time or peak memory grew by more than ``threshold``."""
+    regressions = []
+    for scenario, stages in results.items():
+        for stage, metrics in stages.items():
+            previous = baseline.get(scenario, {}).get(stage)
+            if not previous:
+                continue
+            for metric in ('seconds', 'peak_bytes'):
+                if metric == 'seconds' and previous[metric] < MIN_SECONDS:
+                    continue
+                if previous[metric] and metrics[metric] > previous[metric] * (1 + threshold):
+                    regressions.append(f"{scenario}.{stage}.{metric}: {previous[metric]:.4g} -> {metrics[metric]:.4g}")
+    return regressions
+
+def main(output, baseline_file=None, threshold=0.2, scenarios=None, repeat=3):
+    results = {}
+    for name, model_count, field_count in SCENARIOS:
+        if scenarios and name not in scenarios:
+            continue
+        results[name] = run_scenario(model_count, field_count, repeat)
+        for stage, metrics in results[name].items():
+            print(f"{name:12} {stage:13} {metrics['seconds'] * 1000:10.2f} ms "
+                  f"{metrics['peak_bytes'] / 1024:10.1f} KiB peak {metrics['bytes']:12d} bytes")
+
+    with open(output, 'w') as output_file:
+        json.dump(results, output_file, indent=1, sort_keys=True)
+    print(f"Results written to {output}")
+
+    if baseline_file:
+        with open(baseline_file, 'r') as baseline:
+            regressions = compare(results, json.load(baseline), threshold)
+        if regressions:
+            print(f"Regressions over {threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Odoo model, view and report generators.")
+    parser.add_argument('--output', type=str, default='benchmark_results.json', help='Where to save the results as JSON.')
+    parser.add_argument('--baseline', type=str, help='Earlier results file to compare against.')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown before a stage is flagged, e.g. 0.2 for 20%%.')
+    parser.add_argument('--scenario', action='append', help='Only run the named scenario; can be repeated.')
+    parser.add_argument('--quick', action='store_true', help='Skip the 10k-field and 1,000-model scenarios.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage; the best one is kept.')
+
+    args = parser.parse_args()
+    sys.exit(main(args.output, args.baseline, args.threshold, args.scenario or (QUICK_SCENARIOS if args.quick else None), args.repeat))
@@ -0,0 +1,154 @@
+import os
+import re
+import glob
+import json
+
+CHUNK_SIZE = 1 << 16
+
+# Complete strings, structural characters, or an unterminated string at the end of the buffer
+TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{},]|"')
+WHITESPACE_PATTERN = re.compile(r'[\s,]*')
+
+def definition_paths(source):
+    """Resolve a directory, glob pattern or single file to a sorted list of definition files."""
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '*.json')) + glob.glob(os.path.join(source, '*.jsonl')))
+    if glob.has_magic(source):
+        return sorted(glob.glob(source))
+    return [source]
+
+def iter_definitions(path, chunk_size=CHUNK_SIZE, errors=None):
+    """Yield model definitions one at a time from a JSON file, JSON array or JSONL file.
+
+    Memory is bounded by the largest single definition. Malformed entries are
+    reported with their position and skipped; pass a list as ``errors`` to
+    also collect them as (position, message) pairs.
+    """
+    def report(position, error):
+        print(f"Warning: Skipping malformed definition in {path} at {position}: {error}")
+        if errors is not None:
+            errors.append((position, str(error)))
+
+    with open(path, 'r') as json_file:
+        if path.endswith('.jsonl'):
+            yield from _iter_jsonl(json_file, report)
+        else:
+            yield from _iter_json_array(json_file, report, chunk_size)
+
+def _iter_jsonl(json_file, report):
+    for line_number, line in enumerate(json_file, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as error:
+            report(f"line {line_number}", error)
+            continue
+        if not isinstance(data, dict):
+            report(f"line {line_number}", "expected a JSON object")
+            continue
+        yield data
+
+def _iter_json_array(json_file, report, chunk_size):
+    buffer = json_file.read(chunk_size)
+    offset = 0  # Characters already dropped from the front of the buffer
+    eof = not buffer
+
+    leading = buffer.lstrip()
+    while not leading and not eof:
+        offset += len(buffer)
+        buffer = json_file.read(chunk_size)
+        eof = not buffer
+        leading = buffer.lstrip()
+
+    if not leading.startswith('['):
+        # A single definition such as model.json
+        content = buffer + json_file.read()
+        try:
+            data = json.loads(content)
+        except ValueError as error:
+            report("offset 0", error)
+            return
+        if not isinstance(data, dict):
+            report("offset 0", "expected a JSON object or an array of objects")
+            return
+        yield data
+        return
+
+    position = buffer.index('[') + 1
+    entry_index = 0
+    while True:
+        # Skip separators between entries, reading more when the buffer runs out
+        position = WHITESPACE_PATTERN.match(buffer, position).end()
+        if position >= len(buffer):
+            if eof:
+                report(f"offset {offset + position}", "unterminated array")
+                return
+            chunk = json_file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            offset += position
+            position = 0
+            continue
+        if buffer[position] == ']':
+            return
+
+        start = position
+        end = None
+        # Open brackets of the current entry; a mismatched closer pops down to its opener
+        # so one malformed entry does not swallow the ones after it
+        stack = []
+        # Set after a closer without an opener: the entry is abandoned up to the next top-level comma
+        resyncing = False
+        scan_position = start
+        while end is None:
+            for match in TOKEN_PATTERN.finditer(buffer, scan_position):
+                token = match.group()
+                if token == '"':
+                    # Unterminated string: rescan it once more data is available
+                    scan_position = match.start()
+                    break
+                scan_position = match.end()
+                if token in '{[':
+                    stack.append(token)
+                elif token in '}]':
+                    opener = '{' if token == '}' else '['
+                    if opener not in stack:
+                        stack = []
+                        resyncing = True
+                        continue
+                    while stack.pop() != opener:
+                        pass
+                    if not stack and not resyncing:
+                        end = match.end()
+                        break
+                elif token == ',' and not stack:
+                    end = match.start()
+                    break
+            else:
+                scan_position = len(buffer)
+
+            if end is None:
+                if eof:
+                    report(f"entry {entry_index} (offset {offset + start})", "unexpected end of file")
+                    return
+                # Compact only when reading: entries before this one are dropped once per chunk
+                chunk = json_file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[start:] + chunk
+                offset += start
+                scan_position -= start
+                start = 0
+
+        try:
+            data = json.loads(buffer[start:end])
+        except ValueError as error:
+            report(f"entry {entry_index} (offset {offset + start})", error)
+            data = None
+        if data is not None and not isinstance(data, dict):
+            report(f"entry {entry_index} (offset {offset + start})", "expected a JSON object")
+        elif data is not None:
+            yield data
+
+        entry_index += 1
+        position = end
@@ -0,0 +1,187 @@
+import os
+import io
+import csv
+import random
+from datetime import date, datetime, timedelta
+from xml.sax.saxutils import escape, quoteattr
+from module_workspace import ModuleWorkspace
+from model_spec import parse_fields
+
+# Records that exist in every database, so demo rows can reference them safely
+WELL_KNOWN_REFERENCES = {
+    'res.currency': ['base.USD', 'base.EUR'],
+    'res.company': ['base.main_company'],
+    'res.partner': ['base.partner_admin', 'base.main_partner'],
+    'res.users': ['base.user_admin'],
+    'res.country': ['base.us', 'base.be', 'base.fr'],
+}
+
+# 1x1 transparent PNG, used only when an image or binary field is required
+PLACEHOLDER_PNG = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+
+BASE_DATE = date(2024, 1, 1)
+WORDS = ('alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel', 'india', 'juliet')
+
+class OdooDemoDataGenerator:
+    """Stream seeded, type-correct demo records for a model to data/ as XML or CSV."""
+
+    def __init__(self, model_name, fields, module_path, workspace=None, count=100, seed=0, data_format='xml'):
+        if data_format not in ('xml', 'csv'):
+            raise ValueError(f"Unsupported demo data format: {data_format}")
+        self.model_name = model_name
+        self.fields = parse_fields(fields, model_name)
+        self.module_path = module_path
+        self.count = count
+        self.seed = seed
+        self.data_format = data_format
+        self.owns_workspace = workspace is None
+        self.workspace = workspace or ModuleWorkspace(module_path)
+        self.model_id = model_name.replace('.', '_')
+
+    def create_demo_file(self):
+        # Checked before anything is streamed, so an unloadable file is never written or registered
+        self.validate_required_references()
+
+        # Odoo derives the model of a CSV data file from its name
+        if self.data_format == 'csv':
+            demo_file_name = f"{self.model_name}.csv"
+            chunks = self.iter_csv_content()
+        else:
+            demo_file_name = f"demo_{self.model_id}.xml"
+            chunks = self.iter_xml_content()
+
+        self.warn_unresolved_fields()
+        self.workspace.write_file(os.path.join('data', demo_file_name), chunks)
+
+        print(f"Demo data file created: {self.workspace.path(os.path.join('data', demo_file_name))}")
+        self.update_manifest_file(demo_file_name)
+
+        if self.owns_workspace:
+            self.workspace.flush()
+
+        return 'data/' + demo_file_name
+
+    def record_id(self, index):
+        return f"demo_{self.model_id}_{index}"
+
+    def references(self, field):
+        """External ids a relational field may point to, or None if no valid target is known."""
+        if field.attrs.get('demo_refs'):
+            return field.attrs['demo_refs']
+        if field.comodel_name == self.model_name:
+            return []  # Filled from records generated earlier in the same file
+        return WELL_KNOWN_REFERENCES.get(field.comodel_name)
+
+    def validate_required_references(self):
+        for field in self.fields:
+            if field.type not in ('Many2one', 'Many2many') or not field.required or field.compute:
+                continue
+            references = self.references(field)
+            # A required self reference has nothing to point to in the first record
+            if not references:
+                raise ValueError(f"Required field '{field.name}' on '{self.model_name}' needs demo records of "
+                                 f"'{field.comodel_name}'; set \"demo_refs\" to a list of external ids.")
+
+    def warn_unresolved_fields(self):
+        for field in self.fields:
+            if field.type in ('Many2one', 'Many2many') and self.references(field) is None:
+                print(f"Warning: No demo records known for '{field.comodel_name}'; '{field.name}' is left empty. "
+                      f"Set \"demo_refs\" to a list of external ids.")
+            if field.type == 'Monetary':
+                currency_field = field.attrs.get('currency_field', 'currency_id')
+                if not any(other.name == currency_field for other in self.fields):
+                    print(f"Warning: Monetary field '{field.name}' uses '{currency_field}', which is not defined on "
+                          f"'{self.model_name}'; demo amounts will use the company currency.")
+
+    def iter_values(self, rng, index):
+        """Yield (field, kind, value) for one record; kind is 'value', 'ref' or 'refs'."""
+        for field in self.fields:
+            if field.compute or field.type == 'One2many':
+                continue
+            if field.type in ('Many2one', 'Many2many'):
+                references = self.references(field)
+                if references == [] and index:
+                    # Self references point to an earlier record, so they always resolve
+                    references = [self.record_id(rng.randrange(index))]
+                if not references:
+                    continue
+                if field.type == 'Many2one':
+                    yield field, 'ref', rng.choice(references)
+                else:
+                    yield field, 'refs', rng.sample(references, rng.randint(1, min(3, len(references))))
+                continue
+            value = self.field_value(field, rng, index)
+            if value is not None:
+                yield field, 'value', value
+
+    def field_value(self, field, rng, index):
+        field_type = field.type
+        if field_type == 'Char':
+            return f"{field.string or field.name} {index}"
+        if field_type == 'Text':
+            return " ".join(rng.choice(WORDS) for _ in range(12))
+        if field_type == 'Html':
+            return f"<p>{' '.join(rng.choice(WORDS) for _ in range(12))}</p>"
+        if field_type == 'Integer':
+            return rng.randint(0, 1000)
+        if field_type in ('Float', 'Monetary'):
+            return round(rng.uniform(0, 10000), 2)
+        if field_type == 'Boolean':
+            return rng.random() < 0.5
+        if field_type == 'Selection':
+            return rng.choice(field.options)
+        if field_type == 'Date':
+            return (BASE_DATE + timedelta(days=rng.randrange(730))).isoformat()
+        if field_type == 'Datetime':
+            moment = datetime(BASE_DATE.year, BASE_DATE.month, BASE_DATE.day) + timedelta(seconds=rng.randrange(730 * 86400))
+            return moment.strftime('%Y-%m-%d %H:%M:%S')
+        if field_type in ('Binary', 'Image'):
+            return PLACEHOLDER_PNG if field.required else None
+        return None
+
+    def iter_xml_content(self):
+        rng = random.Random(self.seed)
+        yield "<odoo>\n"
+        for index in range(self.count):
+            yield f"    <record id=\"{self.record_id(index)}\" model=\"{self.model_name}\">\n"
+            for field, kind, value in self.iter_values(rng, index):
+                if kind == 'ref':
+                    yield f"        <field name=\"{field.name}\" ref=\"{value}\"/>\n"
+                elif kind == 'refs':
+                    references = ", ".join(f"ref('{reference}')" for reference in value)
+                    yield f"        <field name=\"{field.name}\" eval=\"[(6, 0, [{references}])]\"/>\n"
+                elif isinstance(value, bool):
+                    yield f"        <field name=\"{field.name}\" eval={quoteattr(str(value))}/>\n"
+                else:
+                    yield f"        <field name=\"{field.name}\">{escape(str(value))}</field>\n"
+            yield "    </record>\n"
+        yield "</odoo>\n"
+
+    def iter_csv_content(self):
+        rng = random.Random(self.seed)
+        columns = ['id'] + [f"{field.name}/id" if field.type in ('Many2one', 'Many2many') else field.name
+                            for field in self.fields if not field.compute and field.type != 'One2many']
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+
+        writer.writeheader()
+        for index in range(self.count):
+            row = {'id': self.record_id(index)}
+            for field, kind, value in self.iter_values(rng, index):
+                if kind == 'ref':
+                    row[f"{field.name}/id"] = value
+                elif kind == 'refs':
+                    row[f"{field.name}/id"] = ",".join(value)
+                else:
+                    row[field.name] = value
+            writer.writerow(row)
+            # Hand each row over as soon as it is written so memory stays constant
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    def update_manifest_file(self, demo_file_name):
+        self.workspace.add_manifest_data('data/' + demo_file_name, key='demo')
+
+        print(f"Updated __manifest__.py to include demo data: {demo_file_name}")
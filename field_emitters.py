@@ -0,0 +1,225 @@
+import re
+
+# Registry mapping field types to the functions that emit their Python declaration.
+# Each emitter is called as emitter(field_spec, model_name) and returns the code line;
+# validators run once on the raw field dict while the FieldSpec is being built.
+FIELD_EMITTERS = {}
+FIELD_VALIDATORS = {}
+
+PLACEHOLDER_PATTERN = re.compile(r'\{(\w+)\}')
+
+INDEX_TYPES = ('btree', 'btree_not_null', 'trigram')
+
+AGGREGATE_FUNCTIONS = ('sum', 'avg', 'min', 'max', 'count')
+
+DEFAULT_IMAGE_VARIANTS = (1024, 512, 128)
+
+# FieldSpec attributes a template can reference directly instead of through FieldSpec.attrs
+SPEC_ATTRIBUTES = ('name', 'string', 'readonly', 'required', 'default', 'help', 'compute', 'index', 'comodel_name')
+
+def register_field_type(type_name, emitter, validator=None):
+    """Register (or replace) the emitter for a field type, e.g. 'Reference' or 'Json'.
+
+    ``validator(field)`` is optional and should raise ValueError for invalid definitions.
+    """
+    FIELD_EMITTERS[type_name] = emitter
+    if validator:
+        FIELD_VALIDATORS[type_name] = validator
+    else:
+        FIELD_VALIDATORS.pop(type_name, None)
+
+def optional_arguments(field):
+    """Render the keyword arguments every field type accepts, such as index= and compute=."""
+    arguments = ""
+    if field.index:
+        arguments += f", index={field.index!r}" if isinstance(field.index, str) else ", index=True"
+    if field.compute:
+        arguments += f", compute={field.compute!r}"
+        if 'store' in field.attrs:
+            arguments += f", store={bool(field.attrs['store'])}"
+    return arguments
+
+def validate_common(field):
+    index = field.get('index')
+    if index not in (None, False, True) and index not in INDEX_TYPES:
+        raise ValueError(f"Field '{field['name']}' has invalid index {index!r}; use true or one of {', '.join(INDEX_TYPES)}.")
+
+    depends = field.get('depends', [])
+    if not isinstance(depends, list) or not all(isinstance(path, str) for path in depends):
+        raise ValueError(f"Field '{field['name']}' must list its 'depends' as field paths.")
+    # A stored value is only recomputed when a dependency changes, so it needs both
+    if field.get('compute') and field.get('store') and not field.get('aggregate') \
+            and not (depends and field.get('compute_expression')):
+        raise ValueError(f"Stored computed field '{field['name']}' needs 'depends' and a 'compute_expression'.")
+
+    aggregate = field.get('aggregate')
+    if aggregate is not None:
+        if not isinstance(aggregate, dict) or not aggregate.get('relation'):
+            raise ValueError(f"Field '{field['name']}' must name the One2many field to aggregate in 'aggregate.relation'.")
+        function = aggregate.get('function', 'sum')
+        if function not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Field '{field['name']}' has invalid aggregate function {function!r}; use one of {', '.join(AGGREGATE_FUNCTIONS)}.")
+        if function != 'count' and not aggregate.get('field'):
+            raise ValueError(f"Field '{field['name']}' must name the child field to {function} in 'aggregate.field'.")
+
+def get_field_emitter(type_name):
+    try:
+        return FIELD_EMITTERS[type_name]
+    except KeyError:
+        raise ValueError(f"Unsupported field type: {type_name}") from None
+
+def template_emitter(template, defaults, prepare=None):
+    """Compile a ``{key}`` template into an f-string emitter once, at registration time.
+
+    ``defaults`` maps template keys to the value used when the field omits them;
+    ``prepare(field, model_name)`` can return extra computed template values.
+    optional_arguments() is appended before the closing parenthesis.
+    """
+    def placeholder(match):
+        key = match.group(1)
+        if key in SPEC_ATTRIBUTES:
+            if defaults.get(key) is None:
+                return f'{{field.{key}}}'
+            return f'{{defaults["{key}"] if field.{key} is None else field.{key}}}'
+        if key in defaults:
+            return f'{{field.attrs.get("{key}", defaults["{key}"])}}'
+        return f'{{extra["{key}"]}}'
+
+    body = PLACEHOLDER_PATTERN.sub(placeholder, template)
+    closing = body.rindex(')')
+    body = body[:closing] + '{optional_arguments(field)}' + body[closing:]
+    source = ["def emit(field, model_name):"]
+    if prepare:
+        source.append("    extra = prepare(field, model_name)")
+    source.append(f"    return f'''{body}'''")
+
+    namespace = {'defaults': dict(defaults), 'prepare': prepare, 'optional_arguments': optional_arguments}
+    exec("\n".join(source), namespace)
+    return namespace['emit']
+
+def validate_selection(field):
+    if 'options' not in field:
+        raise ValueError(f"Field '{field['name']}' of type 'Selection' must have 'options' defined.")
+
+def validate_relation(field):
+    if not field.get('options'):
+        raise ValueError(f"Field '{field['name']}' of type '{field['type']}' must have a valid relation defined in 'options'.")
+
+def validate_one2many(field):
+    validate_relation(field)
+    if 'inverse_name' not in field:
+        raise ValueError(f"Field '{field['name']}' of type 'One2many' must define 'inverse_name'.")
+
+def validate_image(field):
+    variants = field.get('variants', False)
+    if variants not in (True, False) and (not isinstance(variants, list) or
+                                          not all(isinstance(size, int) and size > 0 for size in variants)):
+        raise ValueError(f"Field '{field['name']}' must set 'variants' to true or a list of pixel sizes.")
+
+def image_variants(field):
+    """Return the resized variant sizes of an Image field, largest first."""
+    variants = field.attrs.get('variants', False)
+    if variants is True:
+        variants = DEFAULT_IMAGE_VARIANTS
+    return sorted(set(variants or ()), reverse=True)
+
+def prepare_selection(field, model_name):
+    return {'selection': ", ".join([f"('{opt}', '{opt.capitalize()}')" for opt in field.options])}
+
+def prepare_many2many(field, model_name):
+    comodel_name = field.comodel_name
+    model_table = model_name.replace('.', '_')
+    attrs = field.attrs
+
+    parameters = [
+        f"comodel_name='{comodel_name}'",
+        f"relation='{attrs.get('relation', f'{model_table}_{field.name}_rel')}'",
+        f"column1='{attrs.get('column1', f'{model_table}_id')}'",
+        f"column2='{attrs.get('column2', comodel_name.replace('.', '_') + '_id')}'",
+    ]
+    if 'domain' in attrs:
+        parameters.append(f"domain={attrs['domain']}")
+    if 'context' in attrs:
+        parameters.append(f"context={attrs['context']}")
+    if 'check_company' in attrs:
+        parameters.append(f"check_company={attrs['check_company']}")
+
+    return {'parameters': ", ".join(parameters)}
+
+register_field_type('Html', template_emitter(
+    "    {name} = fields.Html(string='{string}', sanitize={sanitize}, sanitize_overridable={sanitize_overridable}, "
+    "sanitize_tags={sanitize_tags}, sanitize_attributes={sanitize_attributes}, sanitize_style={sanitize_style}, "
+    "strip_style={strip_style}, strip_classes={strip_classes})\n",
+    {'string': None, 'sanitize': True, 'sanitize_overridable': False, 'sanitize_tags': True,
+     'sanitize_attributes': True, 'sanitize_style': False, 'strip_style': False, 'strip_classes': False}))
+
+image_field = template_emitter(
+    "    {name} = fields.Image(string='{string}', max_width={max_width}, max_height={max_height}, "
+    "verify_resolution={verify_resolution}, attachment={attachment})\n",
+    {'string': None, 'max_width': 0, 'max_height': 0, 'verify_resolution': True, 'attachment': True})
+
+def emit_image(field, model_name):
+    # Stored resized copies, so views can read a thumbnail instead of the full image
+    variants = "".join(
+        f"    {field.name}_{size} = fields.Image(string='{field.string or field.name} {size}', related='{field.name}', "
+        f"max_width={size}, max_height={size}, store=True)\n"
+        for size in image_variants(field))
+    return image_field(field, model_name) + variants
+
+register_field_type('Image', emit_image, validate_image)
+
+register_field_type('Selection', template_emitter(
+    "    {name} = fields.Selection([\n        {selection}\n    ], string='{string}', default='{default}', help='{help}', "
+    "readonly={readonly}, required={required})\n",
+    {'string': None, 'default': None, 'help': None, 'readonly': False, 'required': False},
+    prepare_selection), validate_selection)
+
+register_field_type('Many2one', template_emitter(
+    "    {name} = fields.Many2one('{comodel_name}', string='{string}', readonly={readonly}, required={required})\n",
+    {'string': None, 'readonly': False, 'required': False}), validate_relation)
+
+register_field_type('One2many', template_emitter(
+    "    {name} = fields.One2many(comodel_name='{comodel_name}', inverse_name='{inverse_name}', domain={domain}, "
+    "context={context}, auto_join={auto_join}, string='{string}')\n",
+    {'string': None, 'inverse_name': None, 'domain': '[]', 'context': '{}', 'auto_join': False}), validate_one2many)
+
+register_field_type('Many2many', template_emitter(
+    "    {name} = fields.Many2many({parameters}, string='{string}')\n",
+    {'string': None},
+    prepare_many2many), validate_relation)
+
+register_field_type('Float', template_emitter(
+    "    {name} = fields.Float(string='{string}', default={default}, readonly={readonly}, required={required})\n",
+    {'string': None, 'default': 0, 'readonly': False, 'required': False}))
+
+register_field_type('Text', template_emitter(
+    "    {name} = fields.Text(string='{string}', default='{default}', readonly={readonly}, required={required})\n",
+    {'string': '', 'default': '', 'readonly': False, 'required': False}))
+
+register_field_type('Char', template_emitter(
+    "    {name} = fields.Char(string='{string}', default='{default}', readonly={readonly}, required={required})\n",
+    {'string': '', 'default': '', 'readonly': False, 'required': False}))
+
+register_field_type('Integer', template_emitter(
+    "    {name} = fields.Integer(string='{string}', default={default}, readonly={readonly}, required={required})\n",
+    {'string': None, 'default': 0, 'readonly': False, 'required': False}))
+
+register_field_type('Boolean', template_emitter(
+    "    {name} = fields.Boolean(string='{string}', default={default})\n",
+    {'string': None, 'default': False}))
+
+register_field_type('Binary', template_emitter(
+    "    {name} = fields.Binary(string='{string}', attachment={attachment})\n",
+    {'string': None, 'attachment': True}))
+
+register_field_type('Monetary', template_emitter(
+    "    {name} = fields.Monetary(string='{string}', currency_field='{currency_field}')\n",
+    {'string': None, 'currency_field': 'currency_id'}))
+
+register_field_type('Date', template_emitter(
+    "    {name} = fields.Date(string='{string}', readonly={readonly})\n",
+    {'string': None, 'readonly': False}))
+
+register_field_type('Datetime', template_emitter(
+    "    {name} = fields.Datetime(string='{string}', readonly={readonly})\n",
+    {'string': None, 'readonly': False}))
@@ -0,0 +1,106 @@
+import os
+import ast
+import csv
+import json
+import hashlib
+from module_workspace import ACCESS_FILE, INIT_FILE, INIT_IMPORT_PATTERN, MANIFEST_FILE
+from odoo_model import access_record_id
+
+# Bump whenever a generator change alters its output, so cached modules are regenerated
+GENERATOR_VERSION = "11"
+
+CACHE_FILE = '.odoo_ai_cache.json'
+
+class GenerationCache:
+    """Sidecar cache of the definition hash and artifacts produced for each model."""
+
+    def __init__(self, module_path, options=None, force=False):
+        self.module_path = module_path
+        # Forced runs regenerate everything but still record what they produced
+        self.force = force
+        # Run options that change the output, such as demo data settings, are part of every key
+        self.options = options or {}
+        self.entries = {}
+        self.shared_state = None
+
+        cache_file_path = os.path.join(module_path, CACHE_FILE)
+        if os.path.exists(cache_file_path):
+            with open(cache_file_path, 'r') as cache_file:
+                try:
+                    cache_data = json.load(cache_file)
+                except ValueError:
+                    print(f"Warning: Ignoring unreadable cache file {cache_file_path}.")
+                    cache_data = {}
+            if cache_data.get('version') == GENERATOR_VERSION:
+                self.entries = cache_data.get('models', {})
+
+    def definition_digest(self, data):
+        payload = json.dumps([data, self.options], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(f"{GENERATOR_VERSION}:{payload}".encode('utf-8')).hexdigest()
+
+    def is_fresh(self, data):
+        if self.force:
+            return False
+        entry = self.entries.get(data.get('model_name'))
+        if not entry or entry['digest'] != self.definition_digest(data):
+            return False
+        # A deleted artifact has to be regenerated even if the definition is unchanged
+        if not all(os.path.exists(os.path.join(self.module_path, path)) for path in entry['files']):
+            return False
+        return self.is_registered(data, entry['files'])
+
+    def is_registered(self, data, files):
+        """Check that the manifest, models/__init__.py and access file still reference the model's artifacts."""
+        manifest_entries, imports, access_ids = self.load_shared_state()
+        for path in files:
+            directory, file_name = path.split('/', 1)
+            if directory == 'models':
+                if file_name[:-3] not in imports:
+                    return False
+            elif path not in manifest_entries:
+                return False
+        return all(access_record_id(data['model_name'], access['name']) in access_ids
+                   for access in data.get('access_rights', []))
+
+    def load_shared_state(self):
+        """Read the shared module files once per run; they are not written before the run flushes."""
+        if self.shared_state is not None:
+            return self.shared_state
+
+        manifest_entries = set()
+        manifest_path = os.path.join(self.module_path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as manifest_file:
+                try:
+                    manifest = ast.literal_eval(manifest_file.read())
+                except (ValueError, SyntaxError):
+                    manifest = {}
+            for key in ('data', 'demo'):
+                manifest_entries.update(manifest.get(key, []))
+
+        imports = set()
+        init_path = os.path.join(self.module_path, INIT_FILE)
+        if os.path.exists(init_path):
+            with open(init_path, 'r') as init_file:
+                imports = {match.group(1) for match in map(INIT_IMPORT_PATTERN.match, init_file) if match}
+
+        access_ids = set()
+        access_path = os.path.join(self.module_path, ACCESS_FILE)
+        if os.path.exists(access_path):
+            with open(access_path, newline='', mode='r') as access_file:
+                access_ids = {row.get('id') for row in csv.DictReader(access_file)}
+
+        self.shared_state = (manifest_entries, imports, access_ids)
+        return self.shared_state
+
+    def update(self, data, files):
+        self.entries[data['model_name']] = {
+            'digest': self.definition_digest(data),
+            'files': list(files),
+        }
+
+    def save(self, workspace):
+        # The workspace is flushed next, so long-lived caches such as --watch must re-read the shared files
+        self.shared_state = None
+        cache_data = {'version': GENERATOR_VERSION, 'models': self.entries}
+        workspace.write_file(CACHE_FILE, json.dumps(cache_data, indent=1, sort_keys=True) + "\n")
@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import socket
+import argparse
+import threading
+import socketserver
+from module_workspace import ModuleWorkspace
+from model_spec import ModelSpec
+from odoo_ai import ARTIFACTS, run_generators
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+class RPCError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class GenerationService:
+    """The generator calls exposed over JSON-RPC.
+
+    Requests for the same module path are serialized, since they merge into the
+    same manifest, access file and models/__init__.py; different modules run
+    concurrently.
+    """
+
+    def __init__(self):
+        self.locks = {}
+        self.locks_guard = threading.Lock()
+        self.methods = {
+            'generate_model': lambda params: self.generate(params, ('model',)),
+            'generate_views': lambda params: self.generate(params, ('views',)),
+            'generate_report': lambda params: self.generate(params, ('report',)),
+            'preview': self.preview,
+        }
+
+    def module_lock(self, module_path):
+        key = os.path.realpath(module_path)
+        with self.locks_guard:
+            return self.locks.setdefault(key, threading.Lock())
+
+    def parse_params(self, params):
+        if not isinstance(params, dict) or not isinstance(params.get('module_path'), str):
+            raise RPCError(INVALID_PARAMS, "params must be an object with 'definition' and 'module_path'.")
+        if not os.path.isdir(params['module_path']):
+            raise RPCError(INVALID_PARAMS, f"Module path does not exist: {params['module_path']}")
+        try:
+            spec = ModelSpec.from_dict(params.get('definition'))
+        except ValueError as error:
+            raise RPCError(INVALID_PARAMS, str(error))
+        return spec, params['module_path']
+
+    def generate(self, params, artifacts):
+        spec, module_path = self.parse_params(params)
+        with self.module_lock(module_path):
+            workspace = ModuleWorkspace(module_path)
+            try:
+                files = run_generators(spec, workspace, artifacts)
+                touched = workspace.flush()
+            finally:
+                workspace.abort()
+        return {'files': files, 'touched': sorted(touched)}
+
+    def preview(self, params):
+        """Render the requested artifacts into a dry-run workspace and return {path: content} for all of them."""
+        spec, module_path = self.parse_params(params)
+        artifacts = params.get('artifacts', list(ARTIFACTS))
+        if not isinstance(artifacts, list) or not all(artifact in ARTIFACTS for artifact in artifacts):
+            raise RPCError(INVALID_PARAMS, f"'artifacts' must be a list drawn from {', '.join(ARTIFACTS)}.")
+        with self.module_lock(module_path):
+            workspace = ModuleWorkspace(module_path, dry_run=True)
+            run_generators(spec, workspace, artifacts)
+            # Files already up to date on disk are part of the preview too
+            return workspace.rendered_contents()
+
+    def handle(self, request):
+        """Answer one decoded JSON-RPC request; notifications (no id) get no response."""
+        if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' or not isinstance(request.get('method'), str):
+            return error_response(None, INVALID_REQUEST, "Invalid JSON-RPC 2.0 request.")
+        request_id = request.get('id')
+        method = self.methods.get(request['method'])
+        try:
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+            result = method(request.get('params', {}))
+        except RPCError as error:
+            response = error_response(request_id, error.code, error.message)
+        except Exception as error:
+            response = error_response(request_id, INTERNAL_ERROR, f"{type(error).__name__}: {error}")
+        else:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        return response if 'id' in request else None
+
+def error_response(request_id, code, message):
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+class GenerationRequestHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON-RPC: one request per line, one response line per request."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                response = error_response(None, PARSE_ERROR, str(error))
+            else:
+                response = self.server.service.handle(request)
+            if response is not None:
+                self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+                self.wfile.flush()
+
+class GenerationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        if os.path.exists(socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(socket_path)
+                except ConnectionRefusedError:
+                    os.unlink(socket_path)  # Left behind by a server that did not shut down cleanly
+                else:
+                    raise RuntimeError(f"Another server is already listening on {socket_path}.")
+        super().__init__(socket_path, GenerationRequestHandler)
+        self.service = GenerationService()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+def call(socket_path, method, params, request_id=1):
+    """Send one request to a running server and return its decoded response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        request = {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+        client.sendall(json.dumps(request).encode('utf-8') + b"\n")
+        with client.makefile('rb') as response_file:
+            return json.loads(response_file.readline())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the Odoo generators over JSON-RPC on a Unix socket.")
+    parser.add_argument('--socket', type=str, default='/tmp/odoo_ai.sock', help='Path of the Unix socket to listen on.')
+
+    args = parser.parse_args()
+    try:
+        server = GenerationServer(args.socket)
+    except RuntimeError as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+    print(f"Listening on {args.socket}. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.server_close()
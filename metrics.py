@@ -0,0 +1,97 @@
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+from contextlib import contextmanager
+
+class Metrics:
+    """Timings of generation stages plus the files and bytes a run wrote."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events = []  # (stage, model, start, duration, pid)
+        self.files = {}
+
+    def add(self, stage_name, model, start, duration, pid=None):
+        self.events.append((stage_name, model, start, duration, pid or os.getpid()))
+
+    def merge(self, events):
+        """Add events recorded in another process, e.g. a --jobs worker."""
+        self.events.extend(events)
+
+    def record_file(self, relative_path, size):
+        self.files[relative_path] = size
+
+    def summary(self):
+        stages = {}
+        models = {}
+        for stage_name, model, _, duration, _ in self.events:
+            totals = stages.setdefault(stage_name, {'count': 0, 'seconds': 0.0})
+            totals['count'] += 1
+            totals['seconds'] += duration
+            if model:
+                model_stages = models.setdefault(model, {})
+                model_stages[stage_name] = model_stages.get(stage_name, 0.0) + duration
+        return {
+            'total_seconds': time.perf_counter() - self.started,
+            'stages': stages,
+            'models': models,
+            'files': {'count': len(self.files), 'bytes': sum(self.files.values()), 'written': self.files},
+        }
+
+    def chrome_trace(self):
+        """Events in the Trace Event Format read by chrome://tracing and Perfetto."""
+        trace_events = [{
+            'name': stage_name, 'cat': 'odoo_ai', 'ph': 'X', 'pid': 1, 'tid': pid,
+            'ts': round((start - self.started) * 1e6, 1), 'dur': round(duration * 1e6, 1),
+            'args': {'model': model} if model else {},
+        } for stage_name, model, start, duration, pid in self.events]
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms', 'otherData': {'files': self.files}}
+
+    def write(self, output_path, output_format='json'):
+        if output_format not in ('json', 'chrome'):
+            raise ValueError(f"Unsupported metrics format: {output_format}")
+        data = self.chrome_trace() if output_format == 'chrome' else self.summary()
+        with open(output_path, 'w') as output_file:
+            json.dump(data, output_file, indent=1, sort_keys=True)
+        print(f"Metrics written to {output_path}")
+
+# Recorder of the current process; stage() is a no-op while it is None
+_active = None
+
+def enable():
+    global _active
+    _active = Metrics()
+    return _active
+
+def disable():
+    global _active
+    recorder, _active = _active, None
+    return recorder
+
+def active():
+    return _active
+
+@contextmanager
+def stage(stage_name, model=None):
+    if _active is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _active.add(stage_name, model, start, time.perf_counter() - start)
+
+def run_profiled(function, *arguments, top=20):
+    """Run ``function`` under cProfile and print its ``top`` functions by cumulative time."""
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function, *arguments)
+    finally:
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(top)
+        print(f"\n### Top {top} functions by cumulative time ###")
+        print(output.getvalue())
@@ -0,0 +1,213 @@
+import hashlib
+from field_emitters import FIELD_EMITTERS, FIELD_VALIDATORS, INDEX_TYPES, validate_common
+
+RELATIONAL_TYPES = ('Many2one', 'One2many', 'Many2many')
+
+DEFAULT_BULK_IMPORT_CHUNK_SIZE = 1000
+
+# Keys promoted to FieldSpec attributes; everything else stays in FieldSpec.attrs
+COMMON_KEYS = ('name', 'type', 'string', 'readonly', 'required', 'default', 'help', 'compute', 'index', 'options')
+
+class FieldSpec:
+    """Validated, normalized field definition shared by all generators."""
+
+    __slots__ = ('name', 'type', 'string', 'readonly', 'required', 'default', 'help',
+                 'compute', 'index', 'options', 'comodel_name', 'attrs')
+
+    def __init__(self, name, type, string=None, readonly=False, required=False, default=None, help=None,
+                 compute=None, index=None, options=None, attrs=None):
+        self.name = name
+        self.type = type
+        self.string = string
+        self.readonly = readonly
+        self.required = required
+        self.default = default
+        self.help = help
+        self.index = index
+        self.options = options or []
+        self.comodel_name = (self.options[0] if self.options else 'model.related') if type in RELATIONAL_TYPES else None
+        self.attrs = attrs or {}
+        # "compute": true and aggregate fields get the conventional method name
+        if compute is True or (not compute and 'aggregate' in self.attrs):
+            compute = f"_compute_{name}"
+        self.compute = compute or None
+
+    @classmethod
+    def from_dict(cls, field):
+        if not isinstance(field, dict) or not field.get('name') or not field.get('type'):
+            raise ValueError(f"Every field must be an object with a 'name' and a 'type': {field!r}")
+        if field['type'] not in FIELD_EMITTERS:
+            raise ValueError(f"Unsupported field type: {field['type']}")
+
+        validate_common(field)
+        validator = FIELD_VALIDATORS.get(field['type'])
+        if validator:
+            validator(field)
+
+        return cls(
+            field['name'], field['type'],
+            string=field.get('string'),
+            # Computed fields are read-only unless the definition says otherwise
+            readonly=field.get('readonly', bool(field.get('compute') or field.get('aggregate'))),
+            required=field.get('required', False),
+            default=field.get('default'),
+            help=field.get('help'),
+            compute=field.get('compute'),
+            index=field.get('index'),
+            options=field.get('options'),
+            attrs={key: value for key, value in field.items() if key not in COMMON_KEYS},
+        )
+
+    def __repr__(self):
+        return f"FieldSpec({self.name!r}, {self.type!r})"
+
+class IndexSpec:
+    """Composite index declared at model level and created in the generated init() hook."""
+
+    __slots__ = ('name', 'expressions', 'unique', 'method', 'where')
+
+    def __init__(self, name, expressions, unique=False, method='btree', where=''):
+        self.name = name
+        self.expressions = expressions
+        self.unique = unique
+        self.method = method
+        self.where = where
+
+    @classmethod
+    def from_dict(cls, index, model_name):
+        expressions = index.get('fields') if isinstance(index, dict) else None
+        if not expressions or not isinstance(expressions, list):
+            raise ValueError(f"Indexes on '{model_name}' must be objects with a non-empty 'fields' list: {index!r}")
+        if index.get('method', 'btree') not in INDEX_TYPES:
+            raise ValueError(f"Index on '{model_name}' has invalid method {index['method']!r}.")
+
+        name = index.get('name') or f"{model_name.replace('.', '_')}_{'_'.join(expressions)}_index"
+        if len(name) > 63:
+            # PostgreSQL truncates identifiers at 63 bytes; keep long names unique
+            name = f"{name[:54]}_{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+
+        return cls(name, expressions, unique=index.get('unique', False),
+                   method=index.get('method', 'btree'), where=index.get('where', ''))
+
+    def __repr__(self):
+        return f"IndexSpec({self.name!r}, {self.expressions!r})"
+
+def parse_sql_constraint(constraint, model_name):
+    if isinstance(constraint, dict):
+        constraint = (constraint.get('name'), constraint.get('definition'), constraint.get('message', ''))
+    if not isinstance(constraint, (list, tuple)) or len(constraint) != 3 or not all(constraint[:2]):
+        raise ValueError(f"SQL constraints on '{model_name}' need a 'name', a 'definition' and a 'message': {constraint!r}")
+    return tuple(constraint)
+
+def parse_access_rights(access_rights, model_name):
+    if not isinstance(access_rights, list) or not all(
+            isinstance(access, dict) and isinstance(access.get('name'), str) and access['name'] for access in access_rights):
+        raise ValueError(f"'access_rights' on '{model_name}' must be a list of objects with a 'name': {access_rights!r}")
+    return access_rights
+
+def parse_bulk_import(bulk_import, model_name):
+    """Normalize "bulk_import" (true, a chunk size or {"chunk_size": n}) to a chunk size or None."""
+    if bulk_import in (None, False):
+        return None
+    if bulk_import is True:
+        return DEFAULT_BULK_IMPORT_CHUNK_SIZE
+    chunk_size = bulk_import.get('chunk_size', DEFAULT_BULK_IMPORT_CHUNK_SIZE) if isinstance(bulk_import, dict) else bulk_import
+    if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size <= 0:
+        raise ValueError(f"'bulk_import' on '{model_name}' must be true or a positive chunk size.")
+    return chunk_size
+
+class ModelSpec:
+    """Validated model definition; parse the JSON once and hand this to every generator."""
+
+    __slots__ = ('model_name', 'fields', 'module_name', 'report', 'views', 'access_rights',
+                 'sql_constraints', 'indexes', 'list_limit', 'report_chunk_size',
+                 'create_override', 'write_override', 'bulk_import_chunk_size')
+
+    def __init__(self, model_name, fields, module_name='your_module_name', report=False, views=True, access_rights=None,
+                 sql_constraints=None, indexes=None, list_limit=80, report_chunk_size=500,
+                 create_override=False, write_override=False, bulk_import_chunk_size=None):
+        self.model_name = model_name
+        self.fields = fields
+        self.module_name = module_name
+        self.report = report
+        self.views = views
+        self.access_rights = access_rights or []
+        self.sql_constraints = sql_constraints or []
+        self.indexes = indexes or []
+        self.list_limit = list_limit
+        self.report_chunk_size = report_chunk_size
+        self.create_override = create_override
+        self.write_override = write_override
+        self.bulk_import_chunk_size = bulk_import_chunk_size
+
+    @classmethod
+    def from_dict(cls, data):
+        model_name = data.get('model_name') if isinstance(data, dict) else None
+        fields = data.get('fields') if isinstance(data, dict) else None
+        if not model_name or not isinstance(fields, list):
+            raise ValueError("'model_name' must be a string and 'fields' must be a list.")
+
+        field_specs = [FieldSpec.from_dict(field) for field in fields]
+        validate_aggregates(field_specs, model_name)
+        validate_compute_methods(field_specs, model_name)
+
+        return cls(
+            model_name,
+            field_specs,
+            module_name=data.get('module_name', 'your_module_name'),
+            report=data.get('report', False),  # Default to False if not present
+            views=data.get('views', True),
+            access_rights=parse_access_rights(data.get('access_rights', []), model_name),
+            sql_constraints=[parse_sql_constraint(constraint, model_name) for constraint in data.get('sql_constraints', [])],
+            indexes=[IndexSpec.from_dict(index, model_name) for index in data.get('indexes', [])],
+            list_limit=data.get('list_limit', 80),
+            report_chunk_size=data.get('report_chunk_size', 500),
+            create_override=data.get('create_override', False),
+            write_override=data.get('write_override', False),
+            bulk_import_chunk_size=parse_bulk_import(data.get('bulk_import'), model_name),
+        )
+
+    def __repr__(self):
+        return f"ModelSpec({self.model_name!r}, {len(self.fields)} fields)"
+
+def validate_aggregates(fields, model_name):
+    one2many_fields = {field.name for field in fields if field.type == 'One2many'}
+    for field in fields:
+        aggregate = field.attrs.get('aggregate')
+        if aggregate and aggregate['relation'] not in one2many_fields:
+            raise ValueError(f"Field '{field.name}' aggregates '{aggregate['relation']}', "
+                             f"which is not a One2many field of '{model_name}'.")
+
+def validate_compute_methods(fields, model_name):
+    """Fields may share a compute method, except aggregates, whose method is generated around one read_group."""
+    compute_fields = {}
+    for field in fields:
+        if field.compute:
+            compute_fields.setdefault(field.compute, []).append(field)
+    for method_name, method_fields in compute_fields.items():
+        if len(method_fields) == 1:
+            continue
+        field_names = ', '.join(field.name for field in method_fields)
+        if any('aggregate' in field.attrs for field in method_fields):
+            raise ValueError(f"Aggregate fields on '{model_name}' need their own compute method; "
+                             f"'{method_name}' is shared by {field_names}.")
+        if len({bool(field.attrs.get('store')) for field in method_fields}) > 1:
+            raise ValueError(f"Fields sharing '{method_name}' on '{model_name}' must all be stored or all not stored: {field_names}.")
+        if len({bool(field.attrs.get('compute_expression')) for field in method_fields}) > 1:
+            raise ValueError(f"Either every field sharing '{method_name}' on '{model_name}' sets 'compute_expression' "
+                             f"or none does: {field_names}.")
+        names = {field.name for field in method_fields}
+        for field in method_fields:
+            for path in field.attrs.get('depends', []):
+                if path.split('.')[0] in names:
+                    raise ValueError(f"Field '{field.name}' on '{model_name}' depends on '{path}', "
+                                     f"which is computed by the same method '{method_name}'.")
+
+def parse_fields(fields, model_name='model'):
+    """Accept raw field dicts or FieldSpecs and return a list of FieldSpecs."""
+    if all(isinstance(field, FieldSpec) for field in fields):
+        return fields
+    field_specs = [field if isinstance(field, FieldSpec) else FieldSpec.from_dict(field) for field in fields]
+    validate_aggregates(field_specs, model_name)
+    validate_compute_methods(field_specs, model_name)
+    return field_specs
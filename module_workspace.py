@@ -0,0 +1,284 @@
+import os
+import io
+import re
+import ast
+import csv
+import filecmp
+import tempfile
+from metrics import stage
+
+ACCESS_HEADER = ["id", "group_id", "name", "perm_read", "perm_write", "perm_create", "perm_unlink"]
+
+INIT_FILE = os.path.join('models', '__init__.py')
+ACCESS_FILE = os.path.join('security', 'ir.model.access.csv')
+MANIFEST_FILE = '__manifest__.py'
+
+# Spellings of each generated column accepted in an existing access file, e.g. Odoo's "group_id:id"
+ACCESS_COLUMN_ALIASES = {
+    'group_id': ('group_id', 'group_id:id', 'group_id/id'),
+}
+MODEL_COLUMNS = ('model_id:id', 'model_id/id', 'model_id')
+
+INIT_IMPORT_PATTERN = re.compile(r'from \. import (\w+)\s*$')
+
+class ModuleWorkspace:
+    """In-memory view of an Odoo module that the generators write through.
+
+    Shared files are loaded once, edits are merged in memory and everything is
+    written with a single atomic write-and-rename per file on flush(). Access
+    rows are upserted by id and init imports are kept as an ordered set, so
+    regenerating a model leaves both files byte-identical. Generated
+    files can be passed as chunk iterables; they are streamed into a staging
+    file next to their target instead of being held in memory.
+    """
+
+    def __init__(self, module_path, dry_run=False):
+        self.module_path = module_path
+        self.dry_run = dry_run
+        self._reset()
+
+    def path(self, relative_path):
+        return os.path.join(self.module_path, relative_path)
+
+    def write_file(self, relative_path, content):
+        """Queue ``content``, a string or an iterable of string chunks, for ``relative_path``."""
+        self._discard_staged(relative_path)
+        if isinstance(content, str):
+            self.pending_files[relative_path] = content
+        elif self.dry_run:
+            buffer = io.StringIO()
+            buffer.writelines(content)
+            self.pending_files[relative_path] = buffer.getvalue()
+        else:
+            self.pending_files.pop(relative_path, None)
+            self.staged_files[relative_path] = self._stage(self.path(relative_path), content)
+
+    def add_init_import(self, module_name):
+        if self.init_imports is None:
+            self.init_lines, self.init_imports = self._read_init_file()
+        if module_name not in self.init_imports:
+            self.init_imports[module_name] = None
+            self.init_lines.append(f"from . import {module_name}\n")
+
+    def add_access_rows(self, access_rows, model_name=None):
+        """Insert or update access rows, given in ACCESS_HEADER order, by their id.
+
+        Existing rows keep their position, and columns the generator does not know
+        about are left as they are. A file whose header cannot be mapped is not touched.
+        """
+        if self.access_rows is None:
+            self.access_header, self.access_rows = self._read_access_rows()
+        if self.access_header is None:
+            return False
+
+        columns = self._access_columns(self.access_header)
+        for row in access_rows:
+            values = dict(zip(ACCESS_HEADER, (str(value) for value in row)))
+            existing = self.access_rows.get(values['id'])
+            merged = list(existing) if existing else [''] * len(self.access_header)
+            for column_name, column in columns.items():
+                merged[column] = values[column_name]
+            if not existing and model_name:
+                for column, header_name in enumerate(self.access_header):
+                    if header_name in MODEL_COLUMNS:
+                        merged[column] = f"model_{model_name.replace('.', '_')}"
+            self.access_rows[values['id']] = merged
+        return True
+
+    def add_manifest_data(self, data_file, key='data'):
+        if self.manifest_dict is None:
+            with open(self.path(MANIFEST_FILE), 'r') as manifest_file:
+                self.manifest_dict = ast.literal_eval(manifest_file.read())
+        manifest_data = self.manifest_dict.setdefault(key, [])
+        if data_file not in manifest_data:
+            manifest_data.append(data_file)
+
+    def rendered_contents(self):
+        """Return every queued file as a {relative_path: content} dict, changed on disk or not.
+
+        Files streamed to staging files are not included; use a dry-run workspace to keep them in memory.
+        """
+        contents = dict(self.pending_files)
+        if self.init_lines is not None:
+            contents[INIT_FILE] = "".join(self.init_lines)
+        if self.access_header is not None:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(self.access_header)
+            writer.writerows(self.access_rows.values())
+            contents[ACCESS_FILE] = buffer.getvalue()
+        if self.manifest_dict is not None:
+            contents[MANIFEST_FILE] = str(self.manifest_dict).replace("'", "\"") + "\n"  # Convert dict back to string with double quotes
+        return contents
+
+    def pending_contents(self):
+        """Return every pending file whose content differs from disk as a {relative_path: content} dict."""
+        contents = self.rendered_contents()
+        # Leave unchanged files alone so their mtimes do not trigger module upgrades
+        return {relative_path: content for relative_path, content in contents.items()
+                if not self._is_unchanged(relative_path, content)}
+
+    def flush(self):
+        """Write all changed files and return them; in dry-run mode nothing is written.
+
+        Streamed files are returned with ``None`` as their content.
+        """
+        with stage('merge_shared_files'):
+            contents = self.pending_contents()
+        if self.dry_run:
+            return contents
+
+        with stage('write_files'):
+            for relative_path, content in contents.items():
+                self._commit(self.path(relative_path), self._stage(self.path(relative_path), [content]))
+
+        with stage('commit_streamed_files'):
+            for relative_path, temp_path in self.staged_files.items():
+                file_path = self.path(relative_path)
+                if os.path.exists(file_path) and filecmp.cmp(temp_path, file_path, shallow=False):
+                    os.unlink(temp_path)
+                else:
+                    self._commit(file_path, temp_path)
+                    contents[relative_path] = None
+
+        self._reset()
+        return contents
+
+    def abort(self):
+        """Drop every queued edit and delete staged files; does nothing after a successful flush()."""
+        for relative_path in list(self.staged_files):
+            self._discard_staged(relative_path)
+        self._reset()
+
+    def _reset(self):
+        self.pending_files = {}
+        self.staged_files = {}
+        self.init_lines = None
+        self.init_imports = None
+        self.access_header = None
+        self.access_rows = None
+        self.manifest_dict = None
+
+    def _read_text(self, relative_path):
+        file_path = self.path(relative_path)
+        if not os.path.exists(file_path):
+            return ""
+        with open(file_path, 'r') as existing_file:
+            return existing_file.read()
+
+    def _read_init_file(self):
+        """Return the lines of models/__init__.py and its imported modules, dropping repeated imports."""
+        lines = []
+        imports = {}  # Ordered set of imported module names
+        for line in self._read_text(INIT_FILE).splitlines(keepends=True):
+            match = INIT_IMPORT_PATTERN.match(line)
+            if match:
+                if match.group(1) in imports:
+                    continue
+                imports[match.group(1)] = None
+            lines.append(line)
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+        return lines, imports
+
+    def _is_unchanged(self, relative_path, content):
+        file_path = self.path(relative_path)
+        if not os.path.exists(file_path) or os.path.getsize(file_path) != len(content.encode('utf-8')):
+            return False
+        with open(file_path, 'r', newline='') as existing_file:
+            return existing_file.read() == content
+
+    def _read_access_rows(self):
+        access_file_path = self.path(ACCESS_FILE)
+        if not os.path.exists(access_file_path):
+            return list(ACCESS_HEADER), {}
+
+        with open(access_file_path, newline='', mode='r') as access_file:
+            rows = list(csv.reader(access_file))
+        if not rows:
+            return list(ACCESS_HEADER), {}
+
+        header = rows[0]
+        if self._access_columns(header) is None:
+            print(f"Error: Cannot map the header of {access_file_path} to {', '.join(ACCESS_HEADER)}; "
+                  f"leaving the file unchanged. Add the missing columns to update its access rights.")
+            return None, {}
+
+        id_column = header.index('id')
+        access_rows = {}
+        for index, row in enumerate(rows[1:]):
+            if not any(row):
+                continue
+            row = row + [''] * (len(header) - len(row))
+            # Rows without an id cannot be upserted, but are kept as they are
+            access_rows[row[id_column] or ('', index)] = row
+        return header, access_rows
+
+    def _access_columns(self, header):
+        """Map each generated column to its position in ``header``, or return None if one is missing."""
+        columns = {}
+        for column_name in ACCESS_HEADER:
+            for alias in ACCESS_COLUMN_ALIASES.get(column_name, (column_name,)):
+                if alias in header:
+                    columns[column_name] = header.index(alias)
+                    break
+            else:
+                return None
+        return columns
+
+    def _stage(self, file_path, chunks):
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(file_path)}.")
+        try:
+            with os.fdopen(file_descriptor, 'w', newline='') as temp_file:
+                temp_file.writelines(chunks)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return temp_path
+
+    def _commit(self, file_path, temp_path):
+        # mkstemp creates files as 0600, keep the permissions of the file being replaced
+        os.chmod(temp_path, os.stat(file_path).st_mode if os.path.exists(file_path) else 0o644)
+        os.replace(temp_path, file_path)
+
+    def _discard_staged(self, relative_path):
+        temp_path = self.staged_files.pop(relative_path, None)
+        if temp_path:
+            os.unlink(temp_path)
+
+class RecordingWorkspace:
+    """Picklable stand-in for ModuleWorkspace used by worker processes.
+
+    It only records the edits a generator makes; replay() applies them to a real
+    workspace in the parent process, so shared files are merged by one writer.
+    """
+
+    def __init__(self, module_path):
+        self.module_path = module_path
+        self.operations = []
+
+    def path(self, relative_path):
+        return os.path.join(self.module_path, relative_path)
+
+    def write_file(self, relative_path, content):
+        # Chunk generators cannot be pickled back to the parent process
+        if not isinstance(content, str):
+            content = "".join(content)
+        self.operations.append(('write_file', relative_path, content))
+
+    def add_init_import(self, module_name):
+        self.operations.append(('add_init_import', module_name))
+
+    def add_access_rows(self, access_rows, model_name=None):
+        self.operations.append(('add_access_rows', access_rows, model_name))
+        return True
+
+    def add_manifest_data(self, data_file, key='data'):
+        self.operations.append(('add_manifest_data', data_file, key))
+
+    def replay(self, workspace):
+        for method_name, *arguments in self.operations:
+            getattr(workspace, method_name)(*arguments)
@@ -1,9 +1,21 @@
 import os
 import json
 import argparse
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from module_workspace import ModuleWorkspace, RecordingWorkspace
+from generation_cache import GenerationCache
+from model_spec import ModelSpec
+from definition_reader import definition_paths, iter_definitions
 from odoo_model import OdooModelCreator
 from odoo_report import OdooReportGenerator
 from xml_generator import OdooXMLGenerator
+from demo_data import OdooDemoDataGenerator
+import metrics
+from metrics import stage
+from watcher import DefinitionWatcher
+
+ARTIFACTS = ('model', 'views', 'report')
 
 def print_documentation():
     print("\n### JSON Structure Documentation ###")
@@ -17,12 +29,22 @@ def print_documentation():
             "readonly": true,  // Optional
             "required": false,  // Optional
             "default": "default_value",  // Optional
-            "compute": "compute_method_name",  // Optional for computed fields
-            "index": "btree",  // Optional for indexing
+            "compute": "compute_method_name",  // Optional for computed fields, true for _compute_<name>; fields may share a method if they agree on "store"
+            "store": true,  // Optional, store the computed value; requires "depends" and "compute_expression"
+            "depends": ["quantity", "amount"],  // Optional @api.depends paths
+            "compute_expression": "record.quantity * record.amount",  // Optional body of the compute loop; without it the method is left for you to write
+            "aggregate": {"relation": "child_ids", "field": "amount", "function": "sum"},  // Optional read_group compute
+            "index": "btree",  // Optional: true, "btree", "btree_not_null" or "trigram"
             "help": "Tooltip text",  // Optional tooltip
+            "list_view": "hide",  // Optional: true, false, "show" or "hide" (optional column) in the tree view
+            "list_fields": ["display_name"],  // Optional columns of the embedded list for One2many fields
+            "report": false,  // Optional, leave the field out of the generated report
+            "demo_refs": ["base.main_company"],  // Optional external ids used by generated demo data
             "max_width": 1024,  // Optional for Image fields
             "max_height": 768,  // Optional for Image fields
             "verify_resolution": true,  // Optional for Image fields
+            "variants": [1024, 512, 128],  // Optional resized Image variants, true for 1024/512/128
+            "attachment": true,  // Optional for Binary and Image fields, store the data as an attachment
             "sanitize": true,  // Optional for Html fields
             "sanitize_overridable": false,  // Optional for Html fields
             "sanitize_tags": true,  // Optional for Html fields
@@ -32,44 +54,341 @@ def print_documentation():
             "strip_classes": false  // Optional for Html fields
         }
     ],
-    "report": true  // Optional, indicates if a report should be generated
+    "sql_constraints": [  // Optional
+        {"name": "name_uniq", "definition": "unique(name)", "message": "Name must be unique."}
+    ],
+    "indexes": [  // Optional composite indexes, created in the model's init() hook
+        {"fields": ["category_id", "date_created"], "unique": false, "method": "btree", "where": ""}
+    ],
+    "create_override": true,  // Optional @api.model_create_multi create() override
+    "write_override": true,  // Optional batched write() override
+    "bulk_import": {"chunk_size": 1000},  // Optional chunked bulk_import()/bulk_import_csv() helpers
+    "list_limit": 80,  // Optional number of rows per page in the tree view
+    "report": true,  // Optional, indicates if a report should be generated
+    "report_chunk_size": 500  // Optional number of records prefetched and rendered per report block
 }""")
     print("Ensure that all required fields are present and correctly formatted.")
 
-def main(data_file, module_path):
-    with open(data_file, 'r') as json_file:
-        data = json.load(json_file)
-    
-    model_name = data.get('model_name')
-    fields = data.get('fields')
-    report_enabled = data.get('report', False)  # Default to False if not present
-    views_enabled = data.get('views', True)  # Default to False if not present
-    access_rights = data.get('access_rights', [])
-
-    if not model_name or not isinstance(fields, list):
-        print("Error: 'model_name' must be a string and 'fields' must be a list.")
-        print_documentation()
-        return
+# Set once the schema documentation has been printed, so a batch with many invalid definitions shows it only once
+_documentation_shown = False
+
+def parse_definition(data):
+    """Validate a raw definition once and return its ModelSpec, or None when it is invalid."""
+    try:
+        with stage('validate', data.get('model_name') if isinstance(data, dict) else None):
+            return ModelSpec.from_dict(data)
+    except ValueError as error:
+        global _documentation_shown
+        print(f"Error: {error}")
+        if not _documentation_shown:
+            print_documentation()
+            _documentation_shown = True
+        return None
+
+def run_generators(spec, workspace, artifacts=ARTIFACTS):
+    """Run the model, view and report generators named in ``artifacts`` and return the files they produced."""
+    module_path = workspace.module_path
+    generated_files = []
 
     # Create model file
-    model_creator = OdooModelCreator(model_name, fields, module_path)
-    model_creator.create_model_file(access_rights=access_rights)
-    if views_enabled:
-        views_generator = OdooXMLGenerator(model_name, fields, module_path)
-        views_generator.create_xml_file()
+    if 'model' in artifacts:
+        model_creator = OdooModelCreator(spec.model_name, spec.fields, module_path, workspace,
+                                         sql_constraints=spec.sql_constraints, indexes=spec.indexes,
+                                         create_override=spec.create_override, write_override=spec.write_override,
+                                         bulk_import_chunk_size=spec.bulk_import_chunk_size)
+        with stage('model', spec.model_name):
+            generated_files.append('models/' + model_creator.create_model_file(access_rights=spec.access_rights))
+    if spec.views and 'views' in artifacts:
+        views_generator = OdooXMLGenerator(spec.model_name, spec.fields, module_path, workspace,
+                                           list_limit=spec.list_limit, indexes=spec.indexes)
+        with stage('views', spec.model_name):
+            generated_files.append(views_generator.create_xml_file())
     # If report is enabled, initialize the report generator
-    if report_enabled:
-        report_generator = OdooReportGenerator(model_name, data.get('module_name', 'your_module_name'), module_path)
-        report_generator.create_report_file()
+    if spec.report and 'report' in artifacts:
+        report_generator = OdooReportGenerator(spec.model_name, spec.module_name, module_path, workspace,
+                                               fields=spec.fields, chunk_size=spec.report_chunk_size)
+        with stage('report', spec.model_name):
+            generated_files.append(report_generator.create_report_file())
+        generated_files.append('models/' + report_generator.report_model_file_name)
+
+    return generated_files
+
+def run_demo_generator(spec, workspace, demo):
+    """Stream demo records for ``spec`` and return the demo file in a list, or an empty list if it was skipped.
+
+    ``demo`` holds the count, seed and format options.
+    """
+    demo_generator = OdooDemoDataGenerator(spec.model_name, spec.fields, workspace.module_path, workspace,
+                                           count=demo['count'], seed=demo['seed'], data_format=demo['format'])
+    try:
+        with stage('demo', spec.model_name):
+            return [demo_generator.create_demo_file()]
+    except ValueError as error:
+        print(f"Error: Skipping demo data: {error}")
+        return []
+
+def render_model(spec, module_path, record_metrics=False):
+    """Process pool entry point: generate one model into a recording workspace.
+
+    Returns the recorder, the generated files and the stage timings of the worker.
+    """
+    if record_metrics:
+        metrics.enable()
+    recorder = RecordingWorkspace(module_path)
+    generated_files = run_generators(spec, recorder)
+    worker_metrics = metrics.disable()
+    return recorder, generated_files, worker_metrics.events if worker_metrics else []
+
+def generate_model(data, workspace, cache=None, demo=None):
+    """Generate a single definition through ``workspace``; the caller flushes it.
+
+    Definitions unchanged since the run recorded in ``cache`` are skipped.
+    Returns False when the definition is invalid.
+    """
+    # Only valid definitions are cached, so a fresh entry needs no parsing at all
+    if cache is not None:
+        with stage('cache_check', data.get('model_name')):
+            if cache.is_fresh(data):
+                return True
+
+    spec = parse_definition(data)
+    if spec is None:
+        return False
+
+    generated_files = run_generators(spec, workspace)
+    if demo:
+        generated_files.extend(run_demo_generator(spec, workspace, demo))
+    if cache is not None:
+        cache.update(data, generated_files)
+
+    return True
+
+def generate_models_parallel(definitions, workspace, cache, jobs, window_size=None, demo=None):
+    """Spread generation over a process pool and merge the results in input order.
+
+    Definitions are consumed in windows so only a bounded number of them is in memory.
+    """
+    window_size = window_size or jobs * 16
+    model_count = 0
+
+    recorder_metrics = metrics.active()
+
+    def merge(executor, pending):
+        results = executor.map(render_model, [spec for _, spec in pending], repeat(workspace.module_path),
+                               repeat(recorder_metrics is not None))
+        # map() yields in submission order, so the merged output does not depend on the worker count
+        for (data, spec), (recorder, generated_files, events) in zip(pending, results):
+            if recorder_metrics is not None:
+                recorder_metrics.merge(events)
+            with stage('replay', spec.model_name):
+                recorder.replay(workspace)
+            # Demo data is streamed here rather than in a worker, which would have to pickle it whole
+            if demo:
+                generated_files.extend(run_demo_generator(spec, workspace, demo))
+            if cache is not None:
+                cache.update(data, generated_files)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = []
+        for data in definitions:
+            if cache is not None:
+                with stage('cache_check', data.get('model_name')):
+                    fresh = cache.is_fresh(data)
+                if fresh:
+                    model_count += 1
+                    continue
+            spec = parse_definition(data)
+            if spec is None:
+                continue
+            model_count += 1
+            pending.append((data, spec))
+            if len(pending) >= window_size:
+                merge(executor, pending)
+                pending = []
+        if pending:
+            merge(executor, pending)
+
+    return model_count
+
+def load_definitions(source):
+    """Yield model definitions from a directory, glob pattern, JSONL file, JSON array or JSON file."""
+    for path in definition_paths(source):
+        definitions = iter_definitions(path)
+        while True:
+            with stage('load'):
+                data = next(definitions, None)
+            if data is None:
+                break
+            yield data
+
+def print_pending_files(contents):
+    for relative_path, content in sorted(contents.items()):
+        print(f"\n### {relative_path} ###")
+        print(content)
+
+def record_written_files(workspace, contents):
+    recorder = metrics.active()
+    if recorder is None:
+        return
+    for relative_path, content in contents.items():
+        # Streamed files come back without their content; measure them on disk
+        size = os.path.getsize(workspace.path(relative_path)) if content is None else len(content.encode('utf-8'))
+        recorder.record_file(relative_path, size)
+
+def flush_workspace(workspace, cache=None):
+    if cache is not None:
+        with stage('save_cache'):
+            cache.save(workspace)
+
+    with stage('flush'):
+        contents = workspace.flush()
+    record_written_files(workspace, contents)
+    if workspace.dry_run:
+        print_pending_files(contents)
+    elif contents:
+        print(f"Touched {len(contents)} files:")
+        for relative_path in sorted(contents):
+            print(f"  {relative_path}")
+    else:
+        print("All files are up to date.")
+
+def batch_main(source, module_path, dry_run=False, force=False, jobs=1, demo=None):
+    workspace = ModuleWorkspace(module_path, dry_run=dry_run)
+    cache = GenerationCache(module_path, {'demo': demo}, force=force)
+    model_count = 0
+
+    # Every model goes through one workspace, so each shared module file is touched once
+    try:
+        if jobs > 1:
+            model_count = generate_models_parallel(load_definitions(source), workspace, cache, jobs, demo=demo)
+        else:
+            for data in load_definitions(source):
+                if generate_model(data, workspace, cache, demo):
+                    model_count += 1
+
+        if not model_count:
+            print("No valid model definitions found.")
+            return
+
+        flush_workspace(workspace, cache)
+    finally:
+        # Staged files of a failed run must not be left inside the module
+        workspace.abort()
+
+    print(f"Processed {model_count} models.")
+
+def regenerate_changes(changes, module_path, cache=None, demo=None):
+    """Regenerate only the artifacts of ``changes``, a list of (definition, spec, artifacts) tuples."""
+    workspace = ModuleWorkspace(module_path)
+    try:
+        for data, spec, artifacts in changes:
+            if cache is not None and cache.is_fresh(data):
+                continue
+            if not demo:
+                artifacts = artifacts - {'demo'}
+            print(f"Regenerating {', '.join(sorted(artifacts))} for {spec.model_name}")
+            generated_files = run_generators(spec, workspace, artifacts)
+            if 'demo' in artifacts:
+                generated_files.extend(run_demo_generator(spec, workspace, demo))
+            if cache is not None:
+                # Artifacts that were not regenerated keep the files recorded by the earlier run
+                previous_files = cache.entries.get(spec.model_name, {}).get('files', [])
+                cache.update(data, dict.fromkeys(previous_files + generated_files))
+        flush_workspace(workspace, cache)
+    except BaseException:
+        # Entries may have been updated for files that were never written
+        if cache is not None:
+            for _, spec, _ in changes:
+                cache.entries.pop(spec.model_name, None)
+        raise
+    finally:
+        workspace.abort()
+
+def regenerate_watched_changes(changes, watcher, module_path, cache=None, demo=None):
+    """Regenerate ``changes`` without letting a failing model stop the watcher.
+
+    If the batch fails, each model is retried on its own so the others still land.
+    """
+    try:
+        regenerate_changes(changes, module_path, cache, demo)
+        return
+    except Exception as error:
+        print(f"Error: {type(error).__name__}: {error}")
+        if len(changes) == 1:
+            # The next save of a failed model regenerates all of its artifacts
+            watcher.forget(changes[0][1].model_name)
+            return
+
+    print("Regenerating the changed models one at a time.")
+    for change in changes:
+        try:
+            regenerate_changes([change], module_path, cache, demo)
+        except Exception as error:
+            print(f"Error: Could not regenerate {change[1].model_name}: {type(error).__name__}: {error}")
+            watcher.forget(change[1].model_name)
+
+def watch_main(source, module_path, force=False, demo=None, interval=0.5):
+    """Regenerate the module whenever a definition file changes, until interrupted."""
+    cache = GenerationCache(module_path, {'demo': demo}, force=force)
+    watcher = DefinitionWatcher(source, interval=interval)
+
+    regenerate_watched_changes(watcher.load_all(), watcher, module_path, cache, demo)
+    print(f"Watching {source} for changes. Press Ctrl+C to stop.")
+    try:
+        while True:
+            changes = watcher.reload(watcher.wait_for_changes())
+            if changes:
+                regenerate_watched_changes(changes, watcher, module_path, cache, demo)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+def main(data_file, module_path, dry_run=False, force=False, demo=None):
+    with stage('load'), open(data_file, 'r') as json_file:
+        data = json.load(json_file)
+
+    workspace = ModuleWorkspace(module_path, dry_run=dry_run)
+    cache = GenerationCache(module_path, {'demo': demo}, force=force)
+    try:
+        if generate_model(data, workspace, cache, demo):
+            flush_workspace(workspace, cache)
+    finally:
+        workspace.abort()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Create an Odoo model from a JSON definition.")
-    parser.add_argument('--data-file', type=str, required=True, help='Path to the JSON file containing model definition.')
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument('--data-file', type=str, help='Path to the JSON file containing model definition.')
+    source_group.add_argument('--batch', type=str, help='Directory, glob pattern or JSONL file with many model definitions.')
     parser.add_argument('--module-path', type=str, required=True, help='Path to your Odoo module (e.g., /path/to/your/module).')
+    parser.add_argument('--dry-run', action='store_true', help='Print the generated files instead of writing them.')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes used in batch mode.')
+    parser.add_argument('--force', action='store_true', help='Regenerate every model even if its definition is unchanged.')
+    parser.add_argument('--demo-records', type=int, default=0, help='Generate this many synthetic demo records per model.')
+    parser.add_argument('--demo-format', choices=['xml', 'csv'], default='xml', help='File format of the demo data.')
+    parser.add_argument('--demo-seed', type=int, default=0, help='Random seed, so demo data is reproducible.')
+    parser.add_argument('--watch', action='store_true', help='Keep running and regenerate the artifacts affected by each definition change.')
+    parser.add_argument('--watch-interval', type=float, default=0.5, help='Seconds between checks for changed definition files.')
+    parser.add_argument('--metrics', type=str, help='Write per-stage and per-model timings, file counts and bytes written to this file.')
+    parser.add_argument('--metrics-format', choices=['json', 'chrome'], default='json', help='Summary JSON, or a Chrome trace for chrome://tracing.')
+    parser.add_argument('--profile', type=int, nargs='?', const=20, help='Run under cProfile and print the N hottest functions (default 20).')
     
     try:
         args = parser.parse_args()
-        main(args.data_file, args.module_path)
+        demo = {'count': args.demo_records, 'seed': args.demo_seed, 'format': args.demo_format} if args.demo_records > 0 else None
+        if args.metrics:
+            metrics.enable()
+        if args.watch:
+            run, arguments = watch_main, (args.batch or args.data_file, args.module_path, args.force, demo, args.watch_interval)
+        elif args.batch:
+            run, arguments = batch_main, (args.batch, args.module_path, args.dry_run, args.force, args.jobs, demo)
+        else:
+            run, arguments = main, (args.data_file, args.module_path, args.dry_run, args.force, demo)
+        if args.profile:
+            metrics.run_profiled(run, *arguments, top=args.profile)
+        else:
+            run(*arguments)
+        if args.metrics:
+            metrics.disable().write(args.metrics, args.metrics_format)
     except SystemExit:
         parser.print_usage()
         print("\nPlease provide the required options.")
\ No newline at end of file
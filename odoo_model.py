@@ -1,26 +1,169 @@
 import os
 import json
 import argparse
-import csv
+from module_workspace import ModuleWorkspace
+from field_emitters import get_field_emitter
+from model_spec import IndexSpec, parse_fields, parse_sql_constraint
+
+# Batched hooks: create() receives every vals dict of the batch, write() the whole recordset
+CREATE_OVERRIDE = """
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            # Adjust each vals dict here; keep queries out of this loop
+            pass
+        return super().create(vals_list)
+"""
+
+WRITE_OVERRIDE = """
+    def write(self, vals):
+        # A single UPDATE covers the whole recordset; keep logic set-based instead of looping per record
+        return super().write(vals)
+"""
+
+BULK_IMPORT_METHODS = """
+    _bulk_import_chunk_size = {chunk_size}
+
+    @api.model
+    def bulk_import(self, vals_iterable, chunk_size=None):
+        \"\"\"Create records from an iterable of vals dicts in chunks, without chatter tracking.\"\"\"
+        chunk_size = chunk_size or self._bulk_import_chunk_size
+        model = self.with_context(tracking_disable=True, mail_notrack=True, mail_create_nolog=True)
+        count = 0
+        batch = []
+        for vals in vals_iterable:
+            batch.append(vals)
+            if len(batch) >= chunk_size:
+                count += len(model._bulk_import_chunk(batch))
+                batch = []
+        if batch:
+            count += len(model._bulk_import_chunk(batch))
+        return count
+
+    @api.model
+    def bulk_import_csv(self, file_path, chunk_size=None, delimiter=','):
+        \"\"\"Load a CSV file whose header row holds field names, or "field/id" for external ids.\"\"\"
+        with open(file_path, newline='') as csv_file:
+            rows = csv.DictReader(csv_file, delimiter=delimiter)
+            converters = self._bulk_import_converters(rows.fieldnames or [])
+            return self.bulk_import((self._bulk_import_values(row, converters) for row in rows), chunk_size)
+
+    @api.model
+    def bulk_import_xml(self, file_path, chunk_size=None):
+        \"\"\"Load <record> elements of an Odoo data file, streaming them so memory stays flat.\"\"\"
+        def iter_rows():
+            converters = {{}}
+            for _, element in ElementTree.iterparse(file_path):
+                if element.tag != 'record':
+                    continue
+                if element.get('model', self._name) != self._name:
+                    raise ValueError(f"Record {{element.get('id')}} belongs to {{element.get('model')}}, not {{self._name}}.")
+                row = {{}}
+                for field_element in element.iter('field'):
+                    name = field_element.get('name')
+                    if field_element.get('ref'):
+                        row[f"{{name}}/id"] = field_element.get('ref')
+                    elif field_element.get('eval') in ('True', 'False'):
+                        row[name] = field_element.get('eval')
+                    elif field_element.get('eval'):
+                        references = re.findall(r"ref\\('([^']+)'\\)", field_element.get('eval'))
+                        if not references:
+                            raise ValueError(f"Unsupported eval on field {{name}}: {{field_element.get('eval')}}")
+                        row[f"{{name}}/id"] = ','.join(references)
+                    else:
+                        row[name] = field_element.text or ''
+                for column in row.keys() - converters.keys():
+                    converters.update(self._bulk_import_converters([column]))
+                element.clear()
+                yield self._bulk_import_values(row, converters)
+        return self.bulk_import(iter_rows(), chunk_size)
+
+    def _bulk_import_chunk(self, vals_list):
+        records = self.create(vals_list)
+        # Write the chunk and drop it from the cache so memory stays flat across chunks
+        self.env.flush_all()
+        self.env.invalidate_all()
+        return records
+
+    @api.model
+    def _bulk_import_converters(self, columns):
+        \"\"\"Map each column to (field name, converter); unsupported columns are rejected up front.\"\"\"
+        references = {{}}
+
+        def reference(xmlid):
+            if xmlid not in references:
+                references[xmlid] = self.env.ref(xmlid.strip()).id
+            return references[xmlid]
+
+        converters = {{}}
+        for column in columns:
+            if column == 'id':
+                continue  # External id of the row itself; bulk imports do not register it
+            name, external = (column[:-3], True) if column.endswith(('/id', ':id')) else (column, False)
+            field = self._fields.get(name)
+            if field is None:
+                raise ValueError(f"Column {{column}} does not match a field of {{self._name}}.")
+            if field.type == 'many2one':
+                convert = reference if external else int
+            elif field.type == 'many2many':
+                to_id = reference if external else int
+                convert = lambda value, to_id=to_id: [(6, 0, [to_id(item) for item in value.split(',')])]
+            elif external or field.type == 'one2many':
+                raise ValueError(f"Column {{column}} cannot be bulk imported into a {{field.type}} field.")
+            elif field.type == 'integer':
+                convert = int
+            elif field.type in ('float', 'monetary'):
+                convert = float
+            elif field.type == 'boolean':
+                convert = lambda value: value.strip().lower() in ('1', 'true', 'yes')
+            elif field.type == 'date':
+                convert = fields.Date.to_date
+            elif field.type == 'datetime':
+                convert = fields.Datetime.to_datetime
+            else:
+                convert = str
+            converters[column] = (name, convert)
+        return converters
+
+    def _bulk_import_values(self, row, converters):
+        values = {{}}
+        for column, value in row.items():
+            if value in (None, '') or column not in converters:
+                continue
+            name, convert = converters[column]
+            values[name] = convert(value)
+        return values
+"""
+
+def access_record_id(model_name, access_name):
+    return f"access_{model_name}_{access_name}"
 
 class OdooModelCreator:
-    def __init__(self, model_name, fields, module_path):
+    def __init__(self, model_name, fields, module_path, workspace=None, sql_constraints=None, indexes=None,
+                 create_override=False, write_override=False, bulk_import_chunk_size=None):
         self.model_name = model_name
-        self.fields = fields
+        self.fields = parse_fields(fields, model_name)
+        self.sql_constraints = [parse_sql_constraint(constraint, model_name) for constraint in sql_constraints or []]
+        self.indexes = [index if isinstance(index, IndexSpec) else IndexSpec.from_dict(index, model_name)
+                        for index in indexes or []]
+        self.create_override = create_override
+        self.write_override = write_override
+        self.bulk_import_chunk_size = bulk_import_chunk_size
         self.module_path = module_path
+        # Without a shared workspace the generator flushes its own edits immediately
+        self.owns_workspace = workspace is None
+        self.workspace = workspace or ModuleWorkspace(module_path)
         self.model_code = ""
         self.compute_methods = []
 
     def create_model_file(self, access_rights=None):
         model_file_name = f"{self.model_name.replace('.', '_')}.py"
-        model_file_path = os.path.join(self.module_path, 'models', model_file_name)
-
-        self.generate_model_code()
 
-        with open(model_file_path, 'w') as model_file:
-            model_file.write(self.model_code)
+        self.workspace.write_file(os.path.join('models', model_file_name), self.iter_model_code())
 
-        print(f"Model file created: {model_file_path}")
+        print(f"Model file created: {self.workspace.path(os.path.join('models', model_file_name))}")
+        self.warn_missing_indexes()
+        self.warn_manual_compute_methods()
 
         if access_rights:
             access_code = self.add_access_rights(self.model_name, access_rights)
@@ -28,164 +171,137 @@ class OdooModelCreator:
 
         self.update_init_file(model_file_name)
 
+        if self.owns_workspace:
+            self.workspace.flush()
+
+        return model_file_name
+
     def generate_model_code(self):
-        self.model_code = f"""from odoo import models, fields
+        self.model_code = "".join(self.iter_model_code())
+        return self.model_code
+
+    def iter_model_code(self):
+        # Several fields may share one compute method, which then has to assign all of them
+        compute_fields = {}
+        for field in self.fields:
+            if field.compute:
+                compute_fields.setdefault(field.compute, []).append(field)
+        compute_methods = (self.generate_compute_method(fields) for fields in compute_fields.values())
+        self.compute_methods = [method for method in compute_methods if method]
+
+        imports = ["models", "fields"]
+        if self.compute_methods or self.create_override or self.bulk_import_chunk_size:
+            imports.insert(0, "api")
+        if self.indexes:
+            imports.append("tools")
+        if self.bulk_import_chunk_size:
+            yield "import re\nimport csv\nfrom xml.etree import ElementTree\n\n"
+        yield f"""from odoo import {', '.join(imports)}
 
 class {self.model_name.replace('.', '_').capitalize()}(models.Model):
     _name = '{self.model_name}'
     _description = '{self.model_name.replace(".", " ").capitalize()}'
 
 """
-        for field in self.fields:
-            self.validate_field(field)
-            self.add_field_to_model(field)
+        if self.sql_constraints:
+            yield self.generate_sql_constraints()
 
-        if self.compute_methods:
-            self.model_code += "\n" + "\n".join(self.compute_methods)
-
-    def validate_field(self, field):
-        if field['type'] == 'Selection' and 'options' not in field:
-            raise ValueError(f"Field '{field['name']}' of type 'Selection' must have 'options' defined.")
-        if field['type'] in ['Many2one', 'One2many', 'Many2many'] and not field.get('options'):
-            raise ValueError(f"Field '{field['name']}' of type '{field['type']}' must have a valid relation defined in 'options'.")
+        # Fields were validated once while parsing them into FieldSpecs
+        for field in self.fields:
+            yield self.add_field_to_model(field)
 
-    def add_field_to_model(self, field):
-        field_type = field['type']
-        if hasattr(self, f'add_{field_type.lower()}'):
-            method = getattr(self, f'add_{field_type.lower()}')
-            self.model_code += method(field)
-        else:
-            raise ValueError(f"Unsupported field type: {field_type}")
-
-    def add_html(self, field):
-        field_name = field['name']
-        return (f"    {field_name} = fields.Html("
-                f"string='{field.get('string')}', "
-                f"sanitize={field.get('sanitize', True)}, "
-                f"sanitize_overridable={field.get('sanitize_overridable', False)}, "
-                f"sanitize_tags={field.get('sanitize_tags', True)}, "
-                f"sanitize_attributes={field.get('sanitize_attributes', True)}, "
-                f"sanitize_style={field.get('sanitize_style', False)}, "
-                f"strip_style={field.get('strip_style', False)}, "
-                f"strip_classes={field.get('strip_classes', False)})\n")
-
-    def add_image(self, field):
-        field_name = field['name']
-        return (f"    {field_name} = fields.Image("
-                f"string='{field.get('string')}', "
-                f"max_width={field.get('max_width', 0)}, "
-                f"max_height={field.get('max_height', 0)}, "
-                f"verify_resolution={field.get('verify_resolution', True)})\n")
-
-    def add_selection(self, field):
-        field_name = field['name']
-        options = ", ".join([f"('{opt}', '{opt.capitalize()}')" for opt in field.get('options', [])])
-        return f"    {field_name} = fields.Selection([\n        {options}\n    ], string='{field.get('string')}', default='{field.get('default')}', help='{field.get('help')}', readonly={field.get('readonly', False)}, required={field.get('required', False)})\n"
-
-    def add_many2one(self, field):
-        field_name = field['name']
-        relation_model = field.get('options', ['model.related'])[0]
-        return f"    {field_name} = fields.Many2one('{relation_model}', string='{field.get('string')}', readonly={field.get('readonly', False)}, required={field.get('required', False)})\n"
-
-    def add_one2many(self, field):
-        field_name = field['name']
-        comodel_name = field.get('options', ['model.related'])[0]
-        inverse_name = field['inverse_name']
-        domain = field.get('domain', '[]')
-        context = field.get('context', '{}')
-        auto_join = field.get('auto_join', False)
-
-        return (f"    {field_name} = fields.One2many("
-                f"comodel_name='{comodel_name}', "
-                f"inverse_name='{inverse_name}', "
-                f"domain={domain}, "
-                f"context={context}, "
-                f"auto_join={auto_join}, "
-                f"string='{field.get('string')}')\n")
-
-    def add_many2many(self, field):
-        field_name = field['name']
-        comodel_name = field.get('options', ['model.related'])[0]
-
-        parameters = [f"comodel_name='{comodel_name}'"]
-
-        if 'relation' in field:
-            parameters.append(f"relation='{field['relation']}'")
-        else:
-            parameters.append(f"relation='{self.model_name.replace('.', '_')}_{field_name}_rel'")
+        if self.indexes:
+            yield self.generate_init_hook()
 
-        if 'column1' in field:
-            parameters.append(f"column1='{field['column1']}'")
+        if self.compute_methods:
+            yield "\n" + "\n".join(self.compute_methods)
+
+        if self.create_override:
+            yield CREATE_OVERRIDE
+        if self.write_override:
+            yield WRITE_OVERRIDE
+        if self.bulk_import_chunk_size:
+            yield BULK_IMPORT_METHODS.format(chunk_size=self.bulk_import_chunk_size)
+
+    def generate_compute_method(self, fields):
+        """Render the compute method shared by ``fields``, assigning each of them."""
+        aggregate = fields[0].attrs.get('aggregate')
+        if aggregate:
+            return self.generate_aggregate_compute(fields[0], aggregate)
+
+        # Without expressions the method is left to the developer, see warn_manual_compute_methods()
+        if not fields[0].attrs.get('compute_expression'):
+            return None
+
+        depends = list(dict.fromkeys(path for field in fields for path in field.attrs.get('depends', [])))
+        decorator = f"    @api.depends({', '.join(repr(path) for path in depends)})\n" if depends else ""
+        assignments = [f"            record.{field.name} = {field.attrs['compute_expression']}\n" for field in fields]
+
+        # Iterating self keeps Odoo's prefetching, so the whole batch is read in one query per field
+        return (f"{decorator}"
+                f"    def {fields[0].compute}(self):\n"
+                f"        for record in self:\n"
+                f"{''.join(assignments)}")
+
+    def generate_aggregate_compute(self, field, aggregate):
+        relation = next(child for child in self.fields if child.name == aggregate['relation'])
+        inverse_name = relation.attrs['inverse_name']
+        function = aggregate.get('function', 'sum')
+
+        if function == 'count':
+            depends = relation.name
+            read_fields = [inverse_name]
+            value_key = '__count'
         else:
-            parameters.append(f"column1='{self.model_name.replace('.', '_')}_id'")
+            depends = f"{relation.name}.{aggregate['field']}"
+            read_fields = [inverse_name, f"{aggregate['field']}:{function}"]
+            value_key = aggregate['field']
+
+        # One read_group over all children of the batch instead of one query per record
+        return (f"    @api.depends({depends!r})\n"
+                f"    def {field.compute}(self):\n"
+                f"        groups = self.env[{relation.comodel_name!r}].read_group(\n"
+                f"            [({inverse_name!r}, 'in', self._origin.ids)],\n"
+                f"            {read_fields!r},\n"
+                f"            [{inverse_name!r}],\n"
+                f"            lazy=False,\n"
+                f"        )\n"
+                f"        values = {{group[{inverse_name!r}][0]: group[{value_key!r}] for group in groups}}\n"
+                f"        for record in self:\n"
+                f"            record.{field.name} = values.get(record._origin.id, 0)\n")
+
+    def generate_sql_constraints(self):
+        rows = "".join(f"        ({name!r}, {definition!r}, {message!r}),\n"
+                       for name, definition, message in self.sql_constraints)
+        return f"    _sql_constraints = [\n{rows}    ]\n\n"
+
+    def generate_init_hook(self):
+        lines = ["\n    def init(self):\n"]
+        for index in self.indexes:
+            if index.unique:
+                lines.append(f"        tools.create_unique_index(self._cr, {index.name!r}, self._table, {index.expressions!r})\n")
+            else:
+                lines.append(f"        tools.create_index(self._cr, {index.name!r}, self._table, {index.expressions!r}, "
+                             f"method={index.method!r}, where={index.where!r})\n")
+        return "".join(lines)
+
+    def warn_manual_compute_methods(self):
+        methods = {field.compute for field in self.fields
+                   if field.compute and not field.attrs.get('compute_expression') and 'aggregate' not in field.attrs}
+        for method_name in sorted(methods):
+            print(f"Note: '{method_name}' on '{self.model_name}' is not generated; write it in the model file "
+                  f"or set \"compute_expression\" on its fields.")
+
+    def warn_missing_indexes(self):
+        # Many2one columns are the usual targets of domain filters and joins
+        indexed_columns = {index.expressions[0] for index in self.indexes}
+        for field in self.fields:
+            if field.type == 'Many2one' and not field.index and field.name not in indexed_columns:
+                print(f"Warning: Many2one field '{field.name}' on '{self.model_name}' has no index; "
+                      f"consider \"index\": true if it is used in searches or list filters.")
 
-        if 'column2' in field:
-            parameters.append(f"column2='{field['column2']}'")
-        else:
-            parameters.append(f"column2='{comodel_name.replace('.', '_')}_id'")
-
-        if 'domain' in field:
-            parameters.append(f"domain={field['domain']}")
-        if 'context' in field:
-            parameters.append(f"context={field['context']}")
-        if 'check_company' in field:
-            parameters.append(f"check_company={field['check_company']}")
-
-        return (f"    {field_name} = fields.Many2many("
-                f"{', '.join(parameters)}, "
-                f"string='{field.get('string')}'"
-                f")\n")
-
-    def add_float(self, field):
-        field_name = field['name']
-        return f"    {field_name} = fields.Float(string='{field.get('string')}', default={field.get('default', 0)}, readonly={field.get('readonly', False)}, required={field.get('required', False)})\n"
-
-    def add_text(self, field):
-        field_name = field['name']
-        return (
-            f"    {field_name} = fields.Text("
-            f"string='{field.get('string', '')}', "
-            f"default='{field.get('default', '')}', "
-            f"readonly={field.get('readonly', False)}, "
-            f"required={field.get('required', False)}"
-            f")\n"
-        )
-
-    def add_char(self, field):
-        field_name = field['name']
-        return (
-            f"    {field_name} = fields.Char("
-            f"string='{field.get('string', '')}', "
-            f"default='{field.get('default', '')}', "
-            f"readonly={field.get('readonly', False)}, "
-            f"required={field.get('required', False)}"
-            f")\n"
-        )
-
-    def add_integer(self, field):
-        field_name = field['name']
-        return f"    {field_name} = fields.Integer(string='{field.get('string')}', default={field.get('default', 0)}, readonly={field.get('readonly', False)}, required={field.get('required', False)})\n"
-
-    def add_boolean(self, field):
-        field_name = field['name']
-        return f"    {field_name} = fields.Boolean(string='{field.get('string')}', default={field.get('default', False)})\n"
-
-    def add_binary(self, field):
-        field_name = field['name']
-        return f"    {field_name} = fields.Binary(string='{field.get('string')}')\n"
-
-    def add_monetary(self, field):
-        field_name = field['name']
-        currency_field = field.get('currency_field', 'currency_id')  # default currency field
-        return f"    {field_name} = fields.Monetary(string='{field.get('string')}', currency_field='{currency_field}')\n"
-
-    def add_date(self, field):
-        field_name = field['name']
-        return f"    {field_name} = fields.Date(string='{field.get('string')}', readonly={field.get('readonly', False)})\n"
-
-    def add_datetime(self, field):
-        field_name = field['name']
-        return f"    {field_name} = fields.Datetime(string='{field.get('string')}', readonly={field.get('readonly', False)})\n"
+    def add_field_to_model(self, field):
+        return get_field_emitter(field.type)(field, self.model_name)
 
     def add_access_rights(self, model_name, access_rights):
         """Generate access rights for the new model."""
@@ -193,7 +309,7 @@ class {self.model_name.replace('.', '_').capitalize()}(models.Model):
         for access in access_rights:
             group = access.get('group', 'base.group_user')  # Default group
             access_rows.append([
-                f"access_{model_name}_{access['name']}",
+                access_record_id(model_name, access['name']),
                 group,
                 f"{access['name'].capitalize()} Access",
                 access.get('read', 0),
@@ -204,50 +320,12 @@ class {self.model_name.replace('.', '_').capitalize()}(models.Model):
         return access_rows
 
     def write_access_rights_file(self, access_rows):
-        # Define the access file name and directory
-        access_file_name = "ir.model.access.csv"
-        security_directory = os.path.join(self.module_path, 'security')
-        
-        # Construct the full file path for the access rights file
-        access_file_path = os.path.join(security_directory, access_file_name)
-        
-        # Define the header for the CSV file
-        header = ["id", "group_id", "name", "perm_read", "perm_write", "perm_create", "perm_unlink"]
-
-        # Ensure the security directory exists
-        os.makedirs(security_directory, exist_ok=True)
-
-        # Check if the file exists and has content
-        if os.path.exists(access_file_path):
-            with open(access_file_path, newline='', mode='r') as access_file:
-                reader = csv.reader(access_file)
-                existing_header = next(reader)
-
-                # Check if headers match regardless of order
-                if set(existing_header) != set(header):
-                    print(f"Warning: Header mismatch in {access_file_path}. Writing new header.")
-                    # Clear the file and write the new header
-                    access_file.seek(0)  # Reset cursor to beginning
-                    access_file.truncate()  # Clear the file
-                    writer = csv.writer(access_file)
-                    writer.writerow(header)
+        if not self.workspace.add_access_rows(access_rows, model_name=self.model_name):
+            return
+
+        print(f"Access rights updated in: {self.workspace.path(os.path.join('security', 'ir.model.access.csv'))}")
 
-        else:
-            # If the file does not exist, create it and write the header
-            with open(access_file_path, mode='w', newline='') as access_file:
-                writer = csv.writer(access_file)
-                writer.writerow(header)
-
-        # Append new access rights
-        with open(access_file_path, mode='a', newline='') as access_file:
-            writer = csv.writer(access_file)
-            writer.writerows(access_rows)
-
-        print(f"Access rights updated in: {access_file_path}")  
-        
     def update_init_file(self, model_file_name):
-        init_file_path = os.path.join(self.module_path, 'models', '__init__.py')
-        with open(init_file_path, 'a') as init_file:
-            init_file.write(f"\nfrom . import {model_file_name[:-3]}\n")
-        
+        self.workspace.add_init_import(model_file_name[:-3])
+
         print(f"Updated __init__.py to import: {model_file_name[:-3]}")
@@ -1,38 +1,58 @@
 import os
-import ast
+from xml.sax.saxutils import escape
+from module_workspace import ModuleWorkspace
+from model_spec import parse_fields
+from field_emitters import image_variants
+
+RELATIONAL_TYPES = ('Many2one', 'One2many', 'Many2many')
+# Binary payloads cannot be printed; images are only printed through a thumbnail variant
+SKIPPED_TYPES = ('Binary', 'Image')
+
+DEFAULT_CHUNK_SIZE = 500
 
 class OdooReportGenerator:
-    def __init__(self, model_name, module_name, module_path):
+    def __init__(self, model_name, module_name, module_path, workspace=None, fields=None, chunk_size=DEFAULT_CHUNK_SIZE):
         self.model_name = model_name
         self.module_name = module_name
         self.module_path = module_path
+        self.fields = parse_fields(fields or [], model_name)
+        self.chunk_size = chunk_size
+        self.owns_workspace = workspace is None
+        self.workspace = workspace or ModuleWorkspace(module_path)
         self.xml_content = ""
+        self.report_model_file_name = f"report_{self.model_name.replace('.', '_')}.py"
 
     def create_report_file(self):
         report_file_name = f"{self.module_name}_report_{self.model_name.replace('.', '_')}.xml"
-        reports_directory = os.path.join(self.module_path, 'reports')
-        report_file_path = os.path.join(reports_directory, report_file_name)
 
-        # Generate the report content
-        self.generate_report_content()
+        # Stream the generated XML content into the report file
+        self.workspace.write_file(os.path.join('reports', report_file_name), self.iter_report_content())
 
-        # Ensure the reports directory exists
-        os.makedirs(reports_directory, exist_ok=True)
+        print(f"Report file created: {self.workspace.path(os.path.join('reports', report_file_name))}")
 
-        # Write the XML content to the report file
-        with open(report_file_path, 'w') as report_file:
-            report_file.write(self.xml_content)
+        # The report model prefetches relational fields before the template renders
+        self.workspace.write_file(os.path.join('models', self.report_model_file_name), self.iter_report_model_code())
+        self.workspace.add_init_import(self.report_model_file_name[:-3])
 
-        print(f"Report file created: {report_file_path}")
+        print(f"Report model file created: {self.workspace.path(os.path.join('models', self.report_model_file_name))}")
 
         # Update the manifest file with the new report
         self.update_manifest_file(report_file_name)
-    
+
+        if self.owns_workspace:
+            self.workspace.flush()
+
+        return 'reports/' + report_file_name
+
     def generate_report_content(self):
-        self.xml_content += "<odoo>\n"
+        self.xml_content = "".join(self.iter_report_content())
+        return self.xml_content
+
+    def iter_report_content(self):
+        yield "<odoo>\n"
         
         # Report action
-        self.xml_content += f"""
+        yield f"""
     <report
         id="action_report_{self.model_name.replace('.', '_')}"
         model="{self.model_name}"
@@ -42,46 +62,95 @@ class OdooReportGenerator:
         file="{self.module_name}.report_{self.model_name.replace('.', '_')}"
     />
 """
-        # Report template
-        self.xml_content += f"""
+        # Report template, rendered one chunk of records per page block
+        yield f"""
     <template id="report_{self.model_name.replace('.', '_')}">
         <t t-call="web.html_container">
-            <div class="page">
-                <h2>{self.model_name} Report</h2>
-                <t t-foreach="docs" t-as="doc">
-                    <div>
-                        <p>Name: <t t-esc="doc.name"/></p>
-                        <p>Description: <t t-esc="doc.description"/></p>
-                        <!-- Add more fields as needed -->
-                    </div>
-                </t>
-            </div>
+            <t t-foreach="doc_chunks" t-as="chunk">
+                <div class="page">
+                    <h2>{self.model_name} Report</h2>
+                    <t t-foreach="chunk" t-as="doc">
+                        <div>
+"""
+        for field in self.report_fields():
+            yield self.report_line(field)
+
+        yield """                        </div>
+                    </t>
+                </div>
+                <p style="page-break-after: always;"/>
+            </t>
         </t>
     </template>
 """
-        self.xml_content += "</odoo>\n"
+        yield "</odoo>\n"
 
-    def update_manifest_file(self, report_file_name):
-        manifest_file_path = os.path.join(self.module_path, '__manifest__.py')
+    def report_fields(self):
+        fields = []
+        for field in self.fields:
+            if field.attrs.get('report') is False:
+                continue
+            if field.type in SKIPPED_TYPES and not (field.type == 'Image' and image_variants(field)):
+                continue
+            fields.append(field)
+        return fields
 
-        # Load the current manifest as a dictionary
-        with open(manifest_file_path, 'r') as manifest_file:
-            manifest_content = manifest_file.read()
-        
-        # Convert the manifest string to a dictionary
-        manifest_dict = ast.literal_eval(manifest_content)
-
-        # Check if 'data' key exists
-        if 'data' in manifest_dict:
-            # Add the report file to the existing data list if not already present
-            if report_file_name not in manifest_dict['data']:
-                manifest_dict['data'].append('reports/'+report_file_name)
+    def report_line(self, field):
+        label = escape(field.string or field.name.replace('_', ' ').capitalize())
+        if field.type == 'Many2one':
+            value = f"<t t-esc=\"doc.{field.name}.display_name\"/>"
+        elif field.type in ('One2many', 'Many2many'):
+            value = f"<t t-esc=\"', '.join(doc.{field.name}.mapped('display_name'))\"/>"
+        elif field.type == 'Html':
+            value = f"<t t-out=\"doc.{field.name}\"/>"
+        elif field.type == 'Image':
+            thumbnail = f"doc.{field.name}_{image_variants(field)[-1]}"
+            value = f"<img t-if=\"{thumbnail}\" t-att-src=\"image_data_uri({thumbnail})\"/>"
         else:
-            # Create the 'data' key if it doesn't exist
-            manifest_dict['data'] = [report_file_name]
+            value = f"<t t-esc=\"doc.{field.name}\"/>"
+        return f"                            <p>{label}: {value}</p>\n"
 
-        # Write the updated manifest back to the file
-        with open(manifest_file_path, 'w') as manifest_file:
-            manifest_file.write(str(manifest_dict).replace("'", "\"") + "\n")  # Convert dict back to string with double quotes
+    def generate_report_model_code(self):
+        return "".join(self.iter_report_model_code())
+
+    def iter_report_model_code(self):
+        model_id = self.model_name.replace('.', '_')
+        report_fields = self.report_fields()
+        stored_fields = [f"{field.name}_{image_variants(field)[-1]}" if field.type == 'Image' else field.name
+                         for field in report_fields if field.type not in RELATIONAL_TYPES]
+        relational_fields = [field.name for field in report_fields if field.type in RELATIONAL_TYPES]
+
+        yield f"""from odoo import api, models
+
+class Report{model_id.capitalize()}(models.AbstractModel):
+    _name = 'report.{self.module_name}.report_{model_id}'
+    _description = '{self.model_name.replace(".", " ").capitalize()} Report'
+
+    _chunk_size = {self.chunk_size}
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        docs = self.env['{self.model_name}'].browse(docids)
+        doc_chunks = [docs[start:start + self._chunk_size] for start in range(0, len(docs), self._chunk_size)]
+        for chunk in doc_chunks:
+"""
+        # One query per field and chunk instead of one per printed row
+        if stored_fields:
+            yield f"            chunk.read({stored_fields!r})\n"
+        for field_name in relational_fields:
+            yield f"            chunk.mapped({field_name!r}).mapped('display_name')\n"
+        if not stored_fields and not relational_fields:
+            yield "            pass\n"
+
+        yield f"""        return {{
+            'doc_ids': docids,
+            'doc_model': '{self.model_name}',
+            'docs': docs,
+            'doc_chunks': doc_chunks,
+        }}
+"""
+
+    def update_manifest_file(self, report_file_name):
+        self.workspace.add_manifest_data('reports/' + report_file_name)
 
         print(f"Updated __manifest__.py to include: {report_file_name}")
\ No newline at end of file
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from definition_reader import iter_definitions
+
+def read_names(tmp_path, content, chunk_size=8):
+    path = tmp_path / 'models.json'
+    path.write_text(content)
+    return [data['model_name'] for data in iter_definitions(str(path), chunk_size=chunk_size)]
+
+def test_stray_closing_brace_is_skipped(tmp_path):
+    content = '[{"model_name":"a"}, {"model_name":"x"}}, {"model_name":"b"}]'
+    assert read_names(tmp_path, content) == ['a', 'x', 'b']
+
+def test_stray_closing_bracket_does_not_end_the_array(tmp_path):
+    content = '[{"model_name":"a"}, {"model_name":"x", ], {"model_name":"b"}]'
+    assert read_names(tmp_path, content) == ['a', 'b']
+
+def test_large_chunks_give_the_same_result(tmp_path):
+    content = '[{"model_name":"a"}, {"model_name":"x", ], {"model_name":"b"}}, {"model_name":"c"}]'
+    assert read_names(tmp_path, content, chunk_size=1 << 16) == read_names(tmp_path, content) == ['a', 'b', 'c']
@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generation_cache import GenerationCache
+from odoo_ai import batch_main
+
+DEFINITION = {
+    'model_name': 'library.book',
+    'fields': [{'name': 'name', 'type': 'Char'}],
+    'access_rights': [{'name': 'user'}],
+}
+
+def load_cache(module_path, force=False):
+    # Same options as a run without demo data
+    return GenerationCache(str(module_path), {'demo': None}, force=force)
+
+def make_module(tmp_path):
+    module_path = tmp_path / 'library'
+    module_path.mkdir()
+    (module_path / '__manifest__.py').write_text("{'name': 'Library', 'data': []}\n")
+    definitions = tmp_path / 'definitions.json'
+    definitions.write_text(json.dumps([DEFINITION]))
+    return str(definitions), module_path
+
+def test_unchanged_definition_is_fresh(tmp_path):
+    source, module_path = make_module(tmp_path)
+    batch_main(source, str(module_path))
+    assert load_cache(module_path).is_fresh(DEFINITION)
+    assert not load_cache(module_path, force=True).is_fresh(DEFINITION)
+
+def test_forced_run_is_recorded(tmp_path):
+    source, module_path = make_module(tmp_path)
+    batch_main(source, str(module_path), force=True)
+    assert load_cache(module_path).is_fresh(DEFINITION)
+
+def test_reset_manifest_makes_the_model_stale(tmp_path):
+    source, module_path = make_module(tmp_path)
+    batch_main(source, str(module_path))
+    (module_path / '__manifest__.py').write_text("{'name': 'Library', 'data': []}\n")
+    assert not load_cache(module_path).is_fresh(DEFINITION)
+
+    batch_main(source, str(module_path))
+    assert 'views/library_book_views.xml' in (module_path / '__manifest__.py').read_text()
+
+def test_removed_access_row_makes_the_model_stale(tmp_path):
+    source, module_path = make_module(tmp_path)
+    batch_main(source, str(module_path))
+    access_path = module_path / 'security' / 'ir.model.access.csv'
+    access_path.write_text(access_path.read_text().splitlines()[0] + "\n")
+    assert not load_cache(module_path).is_fresh(DEFINITION)
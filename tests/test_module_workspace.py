@@ -0,0 +1,63 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_spec import ModelSpec
+from module_workspace import ModuleWorkspace, ACCESS_FILE, INIT_FILE
+from odoo_ai import run_generators
+
+DEFINITION = {
+    'model_name': 'library.book',
+    'fields': [{'name': 'name', 'type': 'Char'}, {'name': 'pages', 'type': 'Integer'}],
+    'access_rights': [{'name': 'user', 'group': 'base.group_user', 'read': 1}],
+}
+
+def make_module(tmp_path):
+    (tmp_path / '__manifest__.py').write_text("{'name': 'Library', 'data': []}\n")
+    return str(tmp_path)
+
+def generate(module_path):
+    workspace = ModuleWorkspace(module_path)
+    try:
+        run_generators(ModelSpec.from_dict(DEFINITION), workspace)
+        return workspace.flush()
+    finally:
+        workspace.abort()
+
+def read_module(tmp_path):
+    return {str(path.relative_to(tmp_path)): path.read_bytes() for path in tmp_path.rglob('*') if path.is_file()}
+
+def test_repeated_generation_is_byte_identical(tmp_path):
+    module_path = make_module(tmp_path)
+    assert generate(module_path)
+    first = read_module(tmp_path)
+    assert ACCESS_FILE in first and INIT_FILE in first
+
+    assert generate(module_path) == {}
+    assert read_module(tmp_path) == first
+
+def test_aliased_access_header_is_upserted(tmp_path):
+    module_path = make_module(tmp_path)
+    (tmp_path / 'security').mkdir()
+    (tmp_path / ACCESS_FILE).write_text(
+        "id,name,model_id:id,group_id:id,perm_read,perm_write,perm_create,perm_unlink,note\n"
+        "access_manual,manual,model_res_partner,base.group_user,1,0,0,0,keep me\n"
+        "access_library.book_user,old,model_library_book,base.group_user,0,0,0,0,mine\n")
+
+    generate(module_path)
+    lines = (tmp_path / ACCESS_FILE).read_text().splitlines()
+    assert lines[0] == "id,name,model_id:id,group_id:id,perm_read,perm_write,perm_create,perm_unlink,note"
+    assert lines[1] == "access_manual,manual,model_res_partner,base.group_user,1,0,0,0,keep me"
+    # The generated row keeps its position and its extra column
+    assert lines[2] == "access_library.book_user,User Access,model_library_book,base.group_user,1,0,0,0,mine"
+    assert len(lines) == 3
+
+def test_new_rows_fill_the_model_column(tmp_path):
+    module_path = make_module(tmp_path)
+    (tmp_path / 'security').mkdir()
+    (tmp_path / ACCESS_FILE).write_text("id,name,model_id/id,group_id/id,perm_read,perm_write,perm_create,perm_unlink\n")
+
+    generate(module_path)
+    lines = (tmp_path / ACCESS_FILE).read_text().splitlines()
+    assert lines[1] == "access_library.book_user,User Access,model_library_book,base.group_user,1,0,0,0"
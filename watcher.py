@@ -0,0 +1,115 @@
+import os
+import time
+from definition_reader import definition_paths, iter_definitions
+from model_spec import ModelSpec
+
+# Definition keys each artifact is rendered from; a change to any other key regenerates everything
+ARTIFACT_INPUTS = {
+    'model': ('fields', 'access_rights', 'sql_constraints', 'indexes', 'create_override', 'write_override', 'bulk_import'),
+    'views': ('fields', 'views', 'list_limit', 'indexes'),
+    'report': ('fields', 'report', 'report_chunk_size', 'module_name'),
+    'demo': ('fields',),
+}
+
+def affected_artifacts(previous, current):
+    """Return the artifacts that have to be regenerated when a definition changes from ``previous`` to ``current``."""
+    if previous is None:
+        return set(ARTIFACT_INPUTS)
+    artifacts = set()
+    for key in set(previous) | set(current):
+        if previous.get(key) == current.get(key):
+            continue
+        owners = {artifact for artifact, inputs in ARTIFACT_INPUTS.items() if key in inputs}
+        if not owners:
+            return set(ARTIFACT_INPUTS)
+        artifacts |= owners
+    return artifacts
+
+class DefinitionWatcher:
+    """Poll definition files and keep their parsed ModelSpecs in memory between changes.
+
+    Only the standard library is used: files are compared by mtime and size on
+    every poll, and a burst of saves is collapsed into one change once the files
+    have been stable for ``debounce`` seconds.
+    """
+
+    def __init__(self, source, interval=0.5, debounce=0.3):
+        self.source = source
+        self.interval = interval
+        self.debounce = debounce
+        self.snapshot = {}
+        self.path_models = {}  # path: model names defined in it
+        self.definitions = {}  # model name: (raw definition, ModelSpec)
+
+    def forget(self, model_name):
+        """Drop the warm definition of a model, so its next change regenerates every artifact."""
+        self.definitions.pop(model_name, None)
+
+    def take_snapshot(self):
+        snapshot = {}
+        for path in definition_paths(self.source):
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (status.st_mtime_ns, status.st_size)
+        return snapshot
+
+    def wait_for_changes(self):
+        """Block until definition files change and return the paths that were added, edited or removed."""
+        while True:
+            time.sleep(self.interval)
+            snapshot = self.take_snapshot()
+            if snapshot == self.snapshot:
+                continue
+            # Editors often save in several writes; wait until the files stop changing
+            while True:
+                time.sleep(self.debounce)
+                settled = self.take_snapshot()
+                if settled == snapshot:
+                    break
+                snapshot = settled
+            changed_paths = {path for path in set(snapshot) | set(self.snapshot)
+                             if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            return changed_paths
+
+    def load_all(self):
+        """Load every definition file; all models are reported as changed."""
+        self.snapshot = self.take_snapshot()
+        return self.reload(self.snapshot)
+
+    def reload(self, paths):
+        """Re-read ``paths`` and return (definition, spec, artifacts) for each model that changed."""
+        changes = []
+        for path in sorted(paths):
+            model_names = []
+            errors = []
+            if os.path.exists(path):
+                for data in iter_definitions(path, errors=errors):
+                    model_name = data.get('model_name')
+                    previous = self.definitions.get(model_name)
+                    if previous is not None and previous[0] == data:
+                        model_names.append(model_name)
+                        continue  # Unchanged, keep the warm spec
+                    try:
+                        spec = ModelSpec.from_dict(data)
+                    except ValueError as error:
+                        print(f"Error: {path}: {error}")
+                        if previous is not None:
+                            model_names.append(model_name)  # Keep the last valid version
+                        continue
+                    model_names.append(model_name)
+                    changes.append((data, spec, affected_artifacts(previous and previous[0], data)))
+                    self.definitions[model_name] = (data, spec)
+
+            missing = [model_name for model_name in self.path_models.get(path, ()) if model_name not in model_names]
+            if errors:
+                # Likely a half-written save: keep the last valid models until the file parses again
+                model_names += missing
+            else:
+                for model_name in missing:
+                    self.definitions.pop(model_name, None)
+                    print(f"Note: '{model_name}' was removed from {path}; its generated files are left in place.")
+            self.path_models[path] = model_names
+        return changes
@@ -1,32 +1,57 @@
 import os
-import ast
+import re
 import argparse
+from xml.sax.saxutils import quoteattr
+from module_workspace import ModuleWorkspace
+from model_spec import IndexSpec, parse_fields
+from field_emitters import image_variants
+
+# Types that are expensive to fetch for every row of a list view
+HEAVY_TYPES = ('Binary', 'Image', 'Html')
+X2MANY_TYPES = ('One2many', 'Many2many')
+# Types listed as optional="hide" columns so they are only read when a user asks for them
+OPTIONAL_TYPES = ('Text', 'Many2many')
+GROUP_BY_TYPES = ('Many2one', 'Selection', 'Date', 'Datetime', 'Boolean')
+
+DEFAULT_LIST_LIMIT = 80
+EMBEDDED_LIST_LIMIT = 40
 
 class OdooXMLGenerator:
-    def __init__(self, model_name, fields, module_path):
+    def __init__(self, model_name, fields, module_path, workspace=None, list_limit=DEFAULT_LIST_LIMIT, indexes=None):
         self.model_name = model_name
-        self.fields = fields
+        self.fields = parse_fields(fields, model_name)
+        self.list_limit = list_limit
+        self.indexes = [index if isinstance(index, IndexSpec) else IndexSpec.from_dict(index, model_name)
+                        for index in indexes or []]
         self.module_path = module_path
+        self.owns_workspace = workspace is None
+        self.workspace = workspace or ModuleWorkspace(module_path)
         self.xml_content = ""
 
     def create_xml_file(self):
         xml_file_name = f"{self.model_name.replace('.', '_')}_views.xml"
-        xml_file_path = os.path.join(self.module_path, 'views', xml_file_name)
-
-        self.generate_xml_content()
 
-        with open(xml_file_path, 'w') as xml_file:
-            xml_file.write(self.xml_content)
+        self.workspace.write_file(os.path.join('views', xml_file_name), self.iter_xml_content())
 
-        print(f"XML file created: {xml_file_path}")
+        print(f"XML file created: {self.workspace.path(os.path.join('views', xml_file_name))}")
         self.update_manifest_file(xml_file_name)
 
+        if self.owns_workspace:
+            self.workspace.flush()
+
+        return 'views/' + xml_file_name
+
     def generate_xml_content(self):
-        self.xml_content += "<odoo>\n"
+        self.xml_content = "".join(self.iter_xml_content())
+        return self.xml_content
+
+    def iter_xml_content(self):
+        model_id = self.model_name.replace('.', '_')
+        yield "<odoo>\n"
         
         # Form View
-        self.xml_content += f"""
-    <record id="view_form_{self.model_name.replace('.', '_')}" model="ir.ui.view">
+        yield f"""
+    <record id="view_form_{model_id}" model="ir.ui.view">
         <field name="name">{self.model_name} Form</field>
         <field name="model">{self.model_name}</field>
         <field name="arch" type="xml">
@@ -35,68 +60,159 @@ class OdooXMLGenerator:
                     <group>
 """
         for field in self.fields:
-            self.xml_content += f"                    <field name=\"{field['name']}\"/>\n"
+            if field.type not in X2MANY_TYPES or field.type == 'Many2many':
+                yield self.form_field(field)
 
-        self.xml_content += """
+        yield """
                     </group>
-                </sheet>
+"""
+        # x2many fields get their own page with a lightweight embedded list
+        x2many_fields = [field for field in self.fields if field.type == 'One2many']
+        if x2many_fields:
+            yield "                    <notebook>\n"
+            for field in x2many_fields:
+                yield self.embedded_list(field)
+            yield "                    </notebook>\n"
+
+        yield """                </sheet>
             </form>
         </field>
     </record>
 """
         # Tree View
-        self.xml_content += f"""
-    <record id="view_tree_{self.model_name.replace('.', '_')}" model="ir.ui.view">
+        yield f"""
+    <record id="view_tree_{model_id}" model="ir.ui.view">
         <field name="name">{self.model_name} Tree</field>
         <field name="model">{self.model_name}</field>
         <field name="arch" type="xml">
-            <tree string="{self.model_name}">
+            <tree string="{self.model_name}" limit="{self.list_limit}">
 """
         for field in self.fields:
-            self.xml_content += f"                <field name=\"{field['name']}\"/>\n"
+            yield self.tree_field(field)
 
-        self.xml_content += """
+        yield """
             </tree>
         </field>
     </record>
 """
+        # Search View
+        yield from self.iter_search_view()
+
         # Action
-        self.xml_content += f"""
-    <record id="action_{self.model_name.replace('.', '_')}" model="ir.actions.act_window">
+        yield f"""
+    <record id="action_{model_id}" model="ir.actions.act_window">
         <field name="name">{self.model_name}</field>
         <field name="res_model">{self.model_name}</field>
         <field name="view_type">form</field>
         <field name="view_mode">tree,form</field>
+        <field name="search_view_id" ref="view_search_{model_id}"/>
+        <field name="limit">{self.list_limit}</field>
     </record>
 """
         # Menu Item
-        self.xml_content += f"""
-    <menuitem id="menu_{self.model_name.replace('.', '_')}" name="{self.model_name}" action="action_{self.model_name.replace('.', '_')}" sequence="10"/>
+        yield f"""
+    <menuitem id="menu_{model_id}" name="{self.model_name}" action="action_{model_id}" sequence="10"/>
 """
-        self.xml_content += "</odoo>\n"
+        yield "</odoo>\n"
 
-   
-    def update_manifest_file(self, report_file_name):
-        manifest_file_path = os.path.join(self.module_path, '__manifest__.py')
+    def form_field(self, field):
+        if field.type == 'Image':
+            options = {'size': [0, 180]}
+            preview_image = field.attrs.get('preview_image') or self.preview_variant(field)
+            if preview_image:
+                options['preview_image'] = preview_image
+            return f"                    <field name=\"{field.name}\" widget=\"image\" options=\"{options}\"/>\n"
+        if field.type == 'Many2many':
+            return f"                    <field name=\"{field.name}\" widget=\"many2many_tags\"/>\n"
+        return f"                    <field name=\"{field.name}\"/>\n"
 
-        # Load the current manifest as a dictionary
-        with open(manifest_file_path, 'r') as manifest_file:
-            manifest_content = manifest_file.read()
-        
-        # Convert the manifest string to a dictionary
-        manifest_dict = ast.literal_eval(manifest_content)
-
-        # Check if 'data' key exists
-        if 'data' in manifest_dict:
-            # Add the report file to the existing data list if not already present
-            if report_file_name not in manifest_dict['data']:
-                manifest_dict['data'].append('views/'+report_file_name)
+    def preview_variant(self, field):
+        # The smallest variant that is still sharp at form size, else the largest one available
+        variants = image_variants(field)
+        if not variants:
+            return None
+        size = min((size for size in variants if size >= 256), default=variants[0])
+        return f"{field.name}_{size}"
+
+    def thumbnail_variant(self, field):
+        variants = image_variants(field)
+        return f"{field.name}_{variants[-1]}" if variants else None
+
+    def embedded_list(self, field):
+        # Only the listed columns are read for the children, not every field of the comodel
+        columns = "".join(f"                                    <field name=\"{column}\"/>\n"
+                          for column in field.attrs.get('list_fields', ['display_name']))
+        return (f"                        <page string={quoteattr(field.string or field.name)}>\n"
+                f"                            <field name=\"{field.name}\">\n"
+                f"                                <tree limit=\"{EMBEDDED_LIST_LIMIT}\">\n"
+                f"{columns}"
+                f"                                </tree>\n"
+                f"                            </field>\n"
+                f"                        </page>\n")
+
+    def tree_field(self, field):
+        if 'list_view' in field.attrs:
+            visibility = field.attrs['list_view']
+        elif field.type in HEAVY_TYPES or field.type == 'One2many':
+            visibility = False
+        elif field.type in OPTIONAL_TYPES:
+            visibility = 'hide'
         else:
-            # Create the 'data' key if it doesn't exist
-            manifest_dict['data'] = [report_file_name]
+            visibility = True
+
+        if visibility is False:
+            # Images are still listed when a small stored thumbnail exists
+            thumbnail = self.thumbnail_variant(field) if field.type == 'Image' else None
+            if thumbnail and 'list_view' not in field.attrs:
+                return (f"                <field name=\"{thumbnail}\" widget=\"image\" optional=\"show\" "
+                        f"options=\"{{'size': [0, 32]}}\"/>\n")
+            return ""
+        attributes = f" widget=\"many2many_tags\"" if field.type == 'Many2many' else ""
+        if visibility in ('hide', 'show'):
+            attributes += f" optional=\"{visibility}\""
+        return f"                <field name=\"{field.name}\"{attributes}/>\n"
+
+    def indexed_fields(self):
+        indexed_names = {index.expressions[0] for index in self.indexes}
+        return [field for field in self.fields if field.index or field.name in indexed_names]
+
+    def iter_search_view(self):
+        model_id = self.model_name.replace('.', '_')
+        yield f"""
+    <record id="view_search_{model_id}" model="ir.ui.view">
+        <field name="name">{self.model_name} Search</field>
+        <field name="model">{self.model_name}</field>
+        <field name="arch" type="xml">
+            <search string="{self.model_name}">
+"""
+        # Only indexed columns are offered, so searches and filters do not scan the table
+        indexed_fields = self.indexed_fields()
+        for field in indexed_fields:
+            if field.type in ('Char', 'Text', 'Many2one', 'Integer', 'Float', 'Monetary'):
+                yield f"                <field name=\"{field.name}\"/>\n"
+        for field in indexed_fields:
+            if field.type == 'Boolean':
+                yield (f"                <filter name=\"filter_{field.name}\" string={quoteattr(field.string or field.name)} "
+                       f"domain=\"[('{field.name}', '=', True)]\"/>\n")
+            elif field.type == 'Selection':
+                for option in field.options:
+                    # Option values are free text; keep the filter name an identifier and escape the rest
+                    filter_name = re.sub(r'\W', '_', f"filter_{field.name}_{option}")
+                    yield (f"                <filter name=\"{filter_name}\" string={quoteattr(option.capitalize())} "
+                           f"domain={quoteattr(repr([(field.name, '=', option)]))}/>\n")
+        group_by_fields = [field for field in indexed_fields if field.type in GROUP_BY_TYPES]
+        if group_by_fields:
+            yield "                <group expand=\"0\" string=\"Group By\">\n"
+            for field in group_by_fields:
+                yield (f"                    <filter name=\"group_by_{field.name}\" string={quoteattr(field.string or field.name)} "
+                       f"context=\"{{'group_by': '{field.name}'}}\"/>\n")
+            yield "                </group>\n"
+        yield """            </search>
+        </field>
+    </record>
+"""
 
-        # Write the updated manifest back to the file
-        with open(manifest_file_path, 'w') as manifest_file:
-            manifest_file.write(str(manifest_dict).replace("'", "\"") + "\n")  # Convert dict back to string with double quotes
+    def update_manifest_file(self, xml_file_name):
+        self.workspace.add_manifest_data('views/' + xml_file_name)
 
-        print(f"Updated __manifest__.py to include: {report_file_name}")
\ No newline at end of file
+        print(f"Updated __manifest__.py to include: {xml_file_name}")
\ No newline at end of file